@@ -0,0 +1,260 @@
+# bench/run.py
+"""Scenario benchmark for the update/render loop.
+
+    python -m bench.run                      # all scenarios -> bench/results.json
+    python -m bench.run --only enemies_ barrage_
+    python -m bench.run --save-baseline      # store results as bench/baseline.json (not shipped;
+                                             # run once per machine before comparing)
+
+Each scenario is stepped like Game.run (FIXED_UPS / FPS ticks, then a frame
+render + present) on the SDL dummy drivers. Per-frame update and render
+times are reported as mean/p95/p99 in milliseconds, with the world draw and
+radar broken out, plus Python heap allocations per frame from a separate
+tracemalloc pass. When a baseline exists, metrics that got slower than the
+tolerance are flagged and the exit status is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from core import settings as S
+from core.game import Game, FIXED_DT, FIXED_UPS
+from bench.scenarios import build_scenarios
+
+RESULTS_PATH = Path("bench/results.json")
+BASELINE_PATH = Path("bench/baseline.json")
+
+# metric -> keys compared against the baseline
+COMPARED = {
+    "update_ms": ("mean", "p95", "p99"),
+    "render_ms": ("mean", "p95", "p99"),
+    "alloc_kb":  ("mean",),
+}
+# ignore differences smaller than this (per unit) no matter the ratio
+NOISE_FLOOR = {"update_ms": 0.05, "render_ms": 0.05, "alloc_kb": 1.0}
+
+def _summary(samples) -> dict:
+    a = np.asarray(samples, dtype=np.float64)
+    if a.size == 0:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "mean": float(a.mean()),
+        "p50": float(np.percentile(a, 50)),
+        "p95": float(np.percentile(a, 95)),
+        "p99": float(np.percentile(a, 99)),
+        "max": float(a.max()),
+    }
+
+class _PhaseTimer:
+    """Wraps bound methods on instances to accumulate their wall time."""
+    def __init__(self):
+        self.acc = {}
+        self._wrapped = []
+
+    def wrap(self, obj, attr, key):
+        orig = getattr(obj, attr)
+        acc = self.acc
+        acc[key] = 0.0
+        def timed(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return orig(*args, **kwargs)
+            finally:
+                acc[key] += time.perf_counter() - t
+        setattr(obj, attr, timed)
+        self._wrapped.append((obj, attr))
+
+    def take(self, key) -> float:
+        v = self.acc[key]
+        self.acc[key] = 0.0
+        return v
+
+    def unwrap(self):
+        for obj, attr in self._wrapped:
+            delattr(obj, attr)
+        self._wrapped.clear()
+
+def _sized_game(size) -> Game:
+    """A headless Game whose level is built for a (WORLD_W, WORLD_H) of `size`."""
+    saved = S.WORLD_W, S.WORLD_H
+    S.WORLD_W, S.WORLD_H = size
+    try:
+        return Game(headless=True)
+    finally:
+        S.WORLD_W, S.WORLD_H = saved
+
+def _setup(game: Game, sc: dict):
+    world = game.world
+    world.enemy_count = sc["enemies"]
+    game._restart()
+    world.player.god_mode = True  # keep the scene alive for the whole run
+    world.camera.set_zoom(sc["zoom"] if sc["zoom"] is not None else S.CAMERA_ZOOM)
+    world.camera.pos = None
+    world.camera.set_target(world.player)
+
+    state = sc["state"]
+    game.paused = state == "paused"
+    game.debug_menu_open = state == "debug_menu"
+    game.game_over = state == "game_over"
+    game.win = state == "win"
+    game.selected_spell = "spark"
+
+def _frame(game: Game, sc: dict, ticks_per_frame: int, frame_no: int, timer: _PhaseTimer):
+    world = game.world
+    playing = not (game.paused or game.debug_menu_open or game.game_over or game.win)
+
+    if sc["barrage"] and playing and world.enemies:
+        enemies = world.enemies
+        for k in range(sc["barrage"]):
+            e = enemies[(frame_no * sc["barrage"] + k) % len(enemies)]
+            world.cast_spark(e.rect.center)
+
+    t0 = time.perf_counter()
+    if playing:
+        for _ in range(ticks_per_frame):
+            world.update(FIXED_DT)
+    t1 = time.perf_counter()
+    game._present(game._draw_frame())
+    t2 = time.perf_counter()
+
+    return {
+        "update_ms": (t1 - t0) * 1000.0,
+        "render_ms": (t2 - t1) * 1000.0,
+        "world_draw_ms": timer.take("world_draw") * 1000.0,
+        "radar_ms": timer.take("radar") * 1000.0,
+    }
+
+def run_scenario(game: Game, sc: dict, frames: int, warmup: int, alloc_frames: int) -> dict:
+    _setup(game, sc)
+    ticks_per_frame = max(1, round(FIXED_UPS / S.FPS))
+
+    timer = _PhaseTimer()
+    timer.wrap(game.world, "draw", "world_draw")
+    timer.wrap(game.radar, "draw", "radar")
+    try:
+        for i in range(warmup):
+            _frame(game, sc, ticks_per_frame, i, timer)
+
+        series = {"update_ms": [], "render_ms": [], "world_draw_ms": [], "radar_ms": []}
+        for i in range(frames):
+            for k, v in _frame(game, sc, ticks_per_frame, warmup + i, timer).items():
+                series[k].append(v)
+
+        # allocation pass (tracemalloc slows everything, so it is kept separate)
+        alloc_kb, net_kb = [], 0.0
+        tracemalloc.start()
+        try:
+            for i in range(alloc_frames):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                _frame(game, sc, ticks_per_frame, warmup + frames + i, timer)
+                after, peak = tracemalloc.get_traced_memory()
+                alloc_kb.append((peak - before) / 1024.0)
+                net_kb += (after - before) / 1024.0
+        finally:
+            tracemalloc.stop()
+    finally:
+        timer.unwrap()
+
+    result = {k: _summary(v) for k, v in series.items()}
+    result["alloc_kb"] = _summary(alloc_kb)
+    result["alloc_net_kb"] = net_kb
+    result["frames"] = frames
+    result["counts"] = {
+        "enemies": len(game.world.enemies),
+        "enemies_awake": game.world.swarm.n_active,
+        "projectiles": len(game.world.projectiles),
+    }
+    result["scenario"] = dict(sc)
+    return result
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return human-readable regression lines (empty when nothing regressed)."""
+    out = []
+    base_sc = baseline.get("scenarios", {})
+    for name, cur in results["scenarios"].items():
+        base = base_sc.get(name)
+        if base is None:
+            continue
+        for metric, keys in COMPARED.items():
+            for key in keys:
+                b = base.get(metric, {}).get(key)
+                c = cur.get(metric, {}).get(key)
+                if b is None or c is None:
+                    continue
+                if c > b * (1.0 + tolerance) and (c - b) > NOISE_FLOOR[metric]:
+                    pct = (c / b - 1.0) * 100.0 if b > 0 else float("inf")
+                    out.append(f"{name}: {metric}.{key} {b:.3f} -> {c:.3f} (+{pct:.0f}%)")
+    return out
+
+def _parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Floral Foundations scenario benchmark")
+    ap.add_argument("--frames", type=int, default=240, help="measured frames per scenario")
+    ap.add_argument("--warmup", type=int, default=30, help="unmeasured frames before each scenario")
+    ap.add_argument("--alloc-frames", type=int, default=30, help="frames in the tracemalloc pass (0 = skip)")
+    ap.add_argument("--only", nargs="*", default=None, help="run scenarios whose name starts with any prefix")
+    ap.add_argument("--out", type=Path, default=RESULTS_PATH)
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true", help="write results to --baseline as well")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    return ap.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    scenarios = build_scenarios()
+    if args.only:
+        scenarios = [sc for sc in scenarios if any(sc["name"].startswith(p) for p in args.only)]
+
+    game = Game(headless=True)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "fixed_ups": FIXED_UPS,
+            "fps": S.FPS,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": {},
+    }
+    for sc in scenarios:
+        g = _sized_game(sc["world"]) if sc.get("world") else game
+        r = run_scenario(g, sc, args.frames, args.warmup, args.alloc_frames)
+        results["scenarios"][sc["name"]] = r
+        print(f"{sc['name']:<20} update {r['update_ms']['mean']:7.3f} ms (p99 {r['update_ms']['p99']:7.3f})"
+              f"  render {r['render_ms']['mean']:7.3f} ms (p99 {r['render_ms']['p99']:7.3f})"
+              f"  alloc {r['alloc_kb']['mean']:8.1f} KB/frame")
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2))
+    print(f"wrote {args.out}")
+
+    status = 0
+    if args.baseline.exists() and not args.save_baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print(f"REGRESSIONS vs {args.baseline}:")
+            for line in regressions:
+                print("  " + line)
+            status = 1
+        else:
+            print(f"no regressions vs {args.baseline}")
+    elif not args.save_baseline:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"saved baseline {args.baseline}")
+
+    pygame.quit()
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
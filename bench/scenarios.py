@@ -0,0 +1,37 @@
+# bench/scenarios.py
+"""Scripted benchmark scenarios.
+
+Each scenario is a plain dict:
+  name      unique key in the JSON report / baseline
+  enemies   enemy count spawned through TestLevel._spawn_enemies
+  zoom      camera zoom (None = CAMERA_ZOOM)
+  barrage   Spark casts per frame, aimed round-robin at live enemies (0 = none)
+  state     "playing" | "paused" | "debug_menu" | "game_over" | "win"
+  world     (WORLD_W, WORLD_H) the level is built with (None = the settings')
+"""
+from core import settings as S
+
+ENEMY_COUNTS = (20, 100, 500, 2000, 10000)
+BARRAGE_ENEMIES = (100, 2000)
+BARRAGE_RATE = 4
+ZOOM_LEVELS = tuple(0.5 + 0.25 * i for i in range(11))   # 0.5 .. 3.0, the +/- steps
+OVERLAY_STATES = ("paused", "debug_menu", "game_over", "win")
+# big enough that most regions are further than REGION_SLEEP_RADIUS from the player
+STREAMING_WORLD = (16384, 16384)
+STREAMING_ENEMIES = 40000
+
+def _scenario(name, enemies=20, zoom=None, barrage=0, state="playing", world=None):
+    return {"name": name, "enemies": enemies, "zoom": zoom, "barrage": barrage, "state": state, "world": world}
+
+def build_scenarios():
+    out = []
+    for n in ENEMY_COUNTS:
+        out.append(_scenario(f"enemies_{n}", enemies=n))
+    for n in BARRAGE_ENEMIES:
+        out.append(_scenario(f"barrage_{n}", enemies=n, barrage=BARRAGE_RATE))
+    for z in ZOOM_LEVELS:
+        out.append(_scenario(f"zoom_{z:.2f}", enemies=500, zoom=z))
+    for state in OVERLAY_STATES:
+        out.append(_scenario(f"overlay_{state}", enemies=S.LEVEL_ENEMY_COUNT, state=state))
+    out.append(_scenario(f"streaming_{STREAMING_ENEMIES}", enemies=STREAMING_ENEMIES, world=STREAMING_WORLD))
+    return out
@@ -1,19 +1,141 @@
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import os
+import struct
 import pygame
 
+from core import settings as S
+
 class Assets:
     def __init__(self):
         self.images = {}
         self.fonts  = {}
+        self._font_registry = {}        # (name, size, bold) -> Font, resolved once
+        self._text_cache = OrderedDict()  # (font, text, color, antialias) -> Surface
+        self.text_cache_size = getattr(S, "TEXT_CACHE_SIZE", 256)
+        self._sheets = {}                 # path -> decoded, converted sheet
+        self._frames = {}                 # (path, w, h, rows, per_row) -> {row name: [frames]}
+        cache_dir = getattr(S, "SPRITE_CACHE_DIR", None)
+        self.sprite_cache_dir = Path(cache_dir) if cache_dir else None
 
     def load(self):
         # Only spells UI + spell icon
         self.images["btn_spell"] = self._rect_icon((120, 120, 180))  # tab button
         self.images["spark"]     = self._rect_icon((120, 120, 200))  # spell icon
 
-        self.fonts["ui"] = pygame.font.SysFont("consolas", 18)
+        self.fonts["ui"]  = self.font("consolas", 18)
+        self.fonts["big"] = self.font("consolas", 42)  # overlay titles
 
     def _rect_icon(self, color, w=40, h=40):
         surf = pygame.Surface((w, h), pygame.SRCALPHA)
         surf.fill(color)
         pygame.draw.rect(surf, (0, 0, 0), surf.get_rect(), 2)
         return surf
+
+    # ---------- Text ----------
+    def font(self, name: str, size: int, bold: bool = False) -> pygame.font.Font:
+        """System font lookup, done once per (name, size, bold); SysFont scans fonts each call."""
+        key = (name, int(size), bool(bold))
+        f = self._font_registry.get(key)
+        if f is None:
+            f = pygame.font.SysFont(name, int(size), bold=bold)
+            self._font_registry[key] = f
+        return f
+
+    def text(self, font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+        """Rendered text from a bounded LRU cache; unchanged strings cost a dict hit."""
+        key = (font, text, tuple(color), antialias)
+        cache = self._text_cache
+        surf = cache.get(key)
+        if surf is not None:
+            cache.move_to_end(key)
+            return surf
+        surf = font.render(text, antialias, color)
+        cache[key] = surf
+        if len(cache) > self.text_cache_size:
+            cache.popitem(last=False)
+        return surf
+
+    # ---------- Sprite sheets ----------
+    _SHEET_MAGIC = b"FBSH"
+    _SHEET_VERSION = 1
+    _SHEET_HEADER = struct.Struct("<4sHqqII")  # magic, version, src mtime_ns, src size, w, h
+
+    def sheet(self, path) -> pygame.Surface:
+        """Decode + convert a sprite sheet once; every caller gets the same Surface."""
+        key = str(path)
+        surf = self._sheets.get(key)
+        if surf is None:
+            surf = self.add_sheet(key, self.decode_sheet(key))
+        return surf
+
+    def decode_sheet(self, path) -> pygame.Surface:
+        """Unconverted pixels from the sprite cache or the PNG. Touches no shared state, so it may run on a worker thread."""
+        path = str(path)
+        surf = self._read_sheet_cache(path)
+        if surf is None:
+            surf = pygame.image.load(path)
+            self._write_sheet_cache(path, surf)
+        return surf
+
+    def add_sheet(self, path, surf: pygame.Surface) -> pygame.Surface:
+        """Hand-off for a decoded sheet (main thread): convert for fast blits and keep it."""
+        surf = surf.convert_alpha()
+        self._sheets[str(path)] = surf
+        return surf
+
+    def frames(self, path, frame_w: int, frame_h: int, rows, per_row: int) -> dict:
+        """Slice a sheet into {row name: [frame, ...]} once and share the result.
+
+        `rows` names the sheet rows top to bottom. Frames are subsurfaces of the
+        cached sheet (no pixel copies), so they are shared by every Player/NPC
+        using the same sheet and must be treated as read-only.
+        """
+        key = (str(path), int(frame_w), int(frame_h), tuple(rows), int(per_row))
+        anims = self._frames.get(key)
+        if anims is None:
+            sheet = self.sheet(path)
+            anims = {}
+            for row, name in enumerate(rows):
+                anims[name] = [sheet.subsurface((col * frame_w, row * frame_h, frame_w, frame_h))
+                               for col in range(per_row)]
+            self._frames[key] = anims
+        return anims
+
+    def _sheet_cache_path(self, path: str) -> Path:
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        return self.sprite_cache_dir / f"{Path(path).stem}-{digest}.rgba"
+
+    def _read_sheet_cache(self, path: str):
+        """Raw RGBA pixels saved by a previous run, if still newer than the PNG."""
+        if self.sprite_cache_dir is None:
+            return None
+        try:
+            st = os.stat(path)
+            data = self._sheet_cache_path(path).read_bytes()
+        except OSError:
+            return None
+        h = self._SHEET_HEADER
+        if len(data) < h.size:
+            return None
+        magic, version, mtime, size, w, hgt = h.unpack_from(data)
+        if (magic, version, mtime, size) != (self._SHEET_MAGIC, self._SHEET_VERSION, st.st_mtime_ns, st.st_size) \
+                or len(data) != h.size + w * hgt * 4:
+            return None
+        return pygame.image.frombytes(data[h.size:], (w, hgt), "RGBA")
+
+    def _write_sheet_cache(self, path: str, surf: pygame.Surface):
+        if self.sprite_cache_dir is None:
+            return
+        try:
+            st = os.stat(path)
+            header = self._SHEET_HEADER.pack(self._SHEET_MAGIC, self._SHEET_VERSION,
+                                             st.st_mtime_ns, st.st_size, *surf.get_size())
+            out = self._sheet_cache_path(path)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            tmp = out.with_suffix(".tmp")
+            tmp.write_bytes(header + pygame.image.tobytes(surf, "RGBA"))
+            os.replace(tmp, out)
+        except OSError:
+            pass  # the cache is only an optimisation
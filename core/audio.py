@@ -1,10 +1,15 @@
+import io
+import os
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
 import pygame
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from core import settings as S
 
 class AudioManager:
     """Centralized audio controller for music + SFX."""
-    def __init__(self):
+    def __init__(self, music_enabled: bool = True):
         # Safe init (don’t crash if device missing)
         try:
             pygame.mixer.pre_init(44100, -16, 2, 512)
@@ -12,55 +17,190 @@ class AudioManager:
         except Exception:
             pass
 
-        self._sfx: Dict[str, pygame.mixer.Sound] = {}
+        # Decoded SFX, least recently played first; bounded by SFX_CACHE_MB
+        self._sfx: "OrderedDict[str, pygame.mixer.Sound]" = OrderedDict()
+        self._sfx_src: Dict[str, tuple] = {}    # key -> (path, volume), to decode again after eviction
+        self._sfx_size: Dict[str, int] = {}
+        self._sfx_total = 0
+        self._sfx_budget = int(getattr(S, "SFX_CACHE_MB", 32) * 1024 * 1024)
+        self._sfx_profiles = getattr(S, "SFX_PROFILES", {})
+        self._sfx_default = getattr(S, "SFX_DEFAULT_PROFILE", {"priority": 1, "max_instances": 4})
+        self._tick_sfx: set = set()             # keys already started this tick (coalescing)
         self._music_path: Optional[str] = None
+        self._music_data: Dict[str, bytes] = {}  # path -> file bytes (loader hand-off or prefetch)
+        self._loaded_path: Optional[str] = None   # track currently loaded in the mixer
+        self._prefetching: set = set()
+        self._music_failed: set = set()
+        self._pending_play = None                 # (path, loop, fade_ms) waiting for its prefetch
+        self._xfade = None                        # crossfade state, advanced by update()
+        self._queue: deque = deque()              # (path, loop) to play after the current track
+        self._crossfade_ms = getattr(S, "MUSIC_CROSSFADE_MS", 1200)
+        self._paused = False
         self._music_volume = getattr(S, "MUSIC_VOLUME", 0.6)
         self._fade_ms = getattr(S, "MUSIC_FADE_MS", 600)
-        self._enabled = getattr(S, "MUSIC_ENABLED", True)
+        self._enabled = music_enabled and getattr(S, "MUSIC_ENABLED", True)
         self._muted = False
 
-        # Optional: reserve a channel for UI sounds (clicks, popups, etc.)
+        # Voice pool: channel 0 is reserved for UI sounds (clicks, popups, etc.),
+        # the rest are handed out by play_sfx
+        self.ui_channel = None
+        self._voices: list = []
         try:
-            pygame.mixer.set_num_channels(max(8, pygame.mixer.get_num_channels()))
-            self.ui_channel = pygame.mixer.Channel(1)
+            n = max(2, int(getattr(S, "SFX_CHANNELS", 16)))
+            pygame.mixer.set_num_channels(n)
+            pygame.mixer.set_reserved(1)
+            self.ui_channel = pygame.mixer.Channel(0)
+            self._voices = [pygame.mixer.Channel(i) for i in range(1, n)]
         except Exception:
-            self.ui_channel = None
+            pass
+        self._voice_key = [None] * len(self._voices)
+        self._voice_prio = [0] * len(self._voices)
+        self._voice_serial = [0] * len(self._voices)  # start order, to find the oldest voice
+        self._serial = 0
 
     # ---------- Music ----------
+    # pygame has a single music stream, so a "crossfade" is a volume ramp: the
+    # current track fades out, the next one (already in memory) is swapped in
+    # at silence and fades up. update(dt) drives the ramp and the queue.
     def play_music(self, path: Optional[str] = None, *, loop=True, fade_ms: Optional[int] = None):
         if not self._enabled or not pygame.mixer.get_init():
             return
         try:
-            pygame.mixer.music.stop()
             if path is None:
                 path = self._music_path
             else:
                 self._music_path = path
             if not path:
                 return
-            pygame.mixer.music.load(path)
-            vol = 0.0 if self._muted else self._music_volume
-            pygame.mixer.music.set_volume(vol)
+            self._xfade = None
+            self._pending_play = None
+            self._paused = False
+            if path != self._loaded_path and not self._load_music(path):
+                # not in memory yet: read it off-thread and start from update()
+                self._pending_play = (path, loop, fade_ms)
+                self.prefetch_music(path)
+                return
+            # same track already loaded (e.g. a restart): rewinds without touching the disk
+            pygame.mixer.music.set_volume(self._target_volume())
             pygame.mixer.music.play(-1 if loop else 0, fade_ms=fade_ms if fade_ms is not None else self._fade_ms)
         except Exception:
             # Silent fail for prototype
             pass
 
+    def _load_music(self, path: str) -> bool:
+        data = self._music_data.get(path)
+        if data is None:
+            return False
+        # stream from memory; no disk access on the main thread
+        pygame.mixer.music.load(io.BytesIO(data), os.path.splitext(path)[1].lstrip("."))
+        self._loaded_path = path
+        return True
+
+    def _target_volume(self) -> float:
+        return 0.0 if self._muted else self._music_volume
+
+    def add_music(self, path: str, data: bytes):
+        """Hand-off from the asset loader: keep the track's bytes so play_music skips the disk."""
+        self._music_data[path] = data
+
+    def prefetch_music(self, path: Optional[str]):
+        """Read a track into memory on a background thread (no-op if it is there or on its way)."""
+        if not self._enabled or not path or path in self._music_data or path in self._prefetching:
+            return
+        self._prefetching.add(path)
+
+        def work():
+            try:
+                self._music_data[path] = Path(path).read_bytes()
+            except OSError:
+                self._music_failed.add(path)
+            finally:
+                self._prefetching.discard(path)
+        threading.Thread(target=work, name="music-prefetch", daemon=True).start()
+
+    def crossfade_to(self, path: str, ms: Optional[int] = None, *, loop=True):
+        """Fade the current track out and `path` in; waits at full volume until `path` is in memory."""
+        if not self._enabled or not pygame.mixer.get_init() or not path:
+            return
+        self._music_path = path
+        self.prefetch_music(path)
+        if self._loaded_path is None or not pygame.mixer.music.get_busy():
+            self.play_music(path, loop=loop, fade_ms=ms)
+            return
+        ms = self._crossfade_ms if ms is None else ms
+        self._pending_play = None
+        self._xfade = {"path": path, "loop": loop, "half": max(1, ms) / 2000.0, "t": 0.0, "phase": "out"}
+
+    def queue_music(self, path: str, *, loop=False):
+        """Play `path` after the current (non-looping) track ends; prefetched right away."""
+        self.prefetch_music(path)
+        self._queue.append((path, loop))
+
+    def next_track(self, ms: Optional[int] = None):
+        """Crossfade to the head of the queue now."""
+        if self._queue:
+            path, loop = self._queue.popleft()
+            self.crossfade_to(path, ms, loop=loop)
+
+    def update(self, dt: float):
+        """Per-frame: start tracks whose prefetch finished, advance crossfades and the queue."""
+        if not self._enabled or not pygame.mixer.get_init():
+            return
+        try:
+            pending = self._pending_play
+            if pending is not None:
+                if pending[0] in self._music_data:
+                    self.play_music(pending[0], loop=pending[1], fade_ms=pending[2])
+                elif pending[0] in self._music_failed:
+                    self._pending_play = None
+                return
+
+            xf = self._xfade
+            if xf is not None:
+                path = xf["path"]
+                if path in self._music_failed:
+                    self._xfade = None
+                    pygame.mixer.music.set_volume(self._target_volume())
+                    return
+                if path not in self._music_data:
+                    return  # hold the current track until the next one is in memory
+                xf["t"] += dt
+                k = min(1.0, xf["t"] / xf["half"])
+                if xf["phase"] == "out":
+                    pygame.mixer.music.set_volume(self._target_volume() * (1.0 - k))
+                    if k >= 1.0:
+                        self._load_music(path)
+                        pygame.mixer.music.set_volume(0.0)
+                        pygame.mixer.music.play(-1 if xf["loop"] else 0)
+                        xf["phase"], xf["t"] = "in", 0.0
+                else:
+                    pygame.mixer.music.set_volume(self._target_volume() * k)
+                    if k >= 1.0:
+                        self._xfade = None
+            elif self._queue and not pygame.mixer.music.get_busy() and not self._paused:
+                self.next_track()
+        except Exception:
+            pass
+
     def set_music(self, path: str):
         """Just set the track without starting."""
         self._music_path = path
 
     def pause_music(self):
+        self._paused = True
         if pygame.mixer.get_init():
             try: pygame.mixer.music.pause()
             except Exception: pass
 
     def resume_music(self):
+        self._paused = False
         if pygame.mixer.get_init():
             try: pygame.mixer.music.unpause()
             except Exception: pass
 
     def fadeout_music(self, ms: Optional[int] = None):
+        self._xfade = None
+        self._pending_play = None
         if pygame.mixer.get_init():
             try: pygame.mixer.music.fadeout(ms if ms is not None else self._fade_ms)
             except Exception: pass
@@ -84,25 +224,112 @@ class AudioManager:
         if not pygame.mixer.get_init():
             return
         try:
-            snd = pygame.mixer.Sound(path)
-            snd.set_volume(max(0.0, min(1.0, volume)))
-            self._sfx[key] = snd
+            self.add_sfx(key, pygame.mixer.Sound(path), volume, path=path)
         except Exception:
             pass
 
-    def play_sfx(self, key: str, *, channel: Optional[int] = None):
-        """Play a registered sound once."""
-        if not pygame.mixer.get_init():
+    def add_sfx(self, key: str, snd: pygame.mixer.Sound, volume: float = 1.0, path: Optional[str] = None):
+        """Register an already decoded sound (hand-off from the asset loader).
+
+        With a `path` the sound may be evicted from the decoded cache and is
+        decoded again the next time it plays.
+        """
+        if path is not None:
+            self._sfx_src[key] = (path, volume)
+        self._cache_sfx(key, snd, volume)
+
+    def begin_tick(self):
+        """Called once per fixed tick (TestLevel.update): identical sounds triggered within a tick play only once."""
+        self._tick_sfx.clear()
+
+    def play_sfx(self, key: str, *, channel: Optional[Union[int, str]] = None):
+        """Play a registered sound once, through the voice pool unless a channel ("ui" or a number) is given."""
+        if not pygame.mixer.get_init() or key in self._tick_sfx:
             return
-        snd = self._sfx.get(key)
+        if channel == "ui" and self.ui_channel is None:
+            return  # no reserved UI channel (mixer without channels)
+        snd = self._sound(key)
         if not snd:
             return
         try:
             if channel is None:
-                snd.play()
-            elif channel == "ui" and self.ui_channel is not None:
+                prof = self._sfx_profiles.get(key, self._sfx_default)
+                prio = prof.get("priority", self._sfx_default.get("priority", 1))
+                slot = self._pick_voice(key, prio, prof.get("max_instances", self._sfx_default.get("max_instances", 4)))
+                if slot is None:
+                    return  # every voice is busy with something more important
+                self._voices[slot].play(snd)
+                self._serial += 1
+                self._voice_key[slot] = key
+                self._voice_prio[slot] = prio
+                self._voice_serial[slot] = self._serial
+            elif channel == "ui":
                 self.ui_channel.play(snd)
             else:
                 pygame.mixer.Channel(int(channel)).play(snd)
+            self._tick_sfx.add(key)
         except Exception:
             pass
+
+    def _pick_voice(self, key: str, priority: int, max_instances: int) -> Optional[int]:
+        """Pool slot for a new voice of `key`, or None to drop it.
+
+        Past `max_instances` the oldest voice of the same sound is restarted;
+        otherwise a free channel is used, else the oldest voice with the lowest
+        priority not above `priority` is stolen.
+        """
+        keys, prios, serials = self._voice_key, self._voice_prio, self._voice_serial
+        free = victim = None
+        same = []
+        for i, ch in enumerate(self._voices):
+            if not ch.get_busy():
+                if free is None:
+                    free = i
+            elif keys[i] == key:
+                same.append(i)
+            elif prios[i] <= priority and (victim is None or (prios[i], serials[i]) < (prios[victim], serials[victim])):
+                victim = i
+        if len(same) >= max(1, max_instances):
+            return min(same, key=serials.__getitem__)
+        return free if free is not None else victim
+
+    def _sound(self, key: str) -> Optional[pygame.mixer.Sound]:
+        snd = self._sfx.get(key)
+        if snd is not None:
+            self._sfx.move_to_end(key)
+            return snd
+        src = self._sfx_src.get(key)
+        if src is None:
+            return None
+        try:
+            snd = pygame.mixer.Sound(src[0])  # evicted earlier: decode again
+        except Exception:
+            return None
+        self._cache_sfx(key, snd, src[1])
+        return snd
+
+    def _cache_sfx(self, key: str, snd: pygame.mixer.Sound, volume: float):
+        snd.set_volume(max(0.0, min(1.0, volume)))
+        if key in self._sfx:
+            del self._sfx[key]
+            self._sfx_total -= self._sfx_size.pop(key)
+        size = self._sound_bytes(snd)
+        self._sfx[key] = snd
+        self._sfx_size[key] = size
+        self._sfx_total += size
+        # evict least recently played sounds that can be decoded again
+        for old in list(self._sfx):
+            if self._sfx_total <= self._sfx_budget:
+                break
+            if old != key and old in self._sfx_src:
+                del self._sfx[old]  # a channel still playing it keeps its own reference
+                self._sfx_total -= self._sfx_size.pop(old)
+
+    @staticmethod
+    def _sound_bytes(snd: pygame.mixer.Sound) -> int:
+        """Decoded size estimate: length x sample rate x channels x bytes per sample."""
+        init = pygame.mixer.get_init()
+        if not init:
+            return 0
+        freq, fmt, chans = init
+        return int(snd.get_length() * freq * chans * (abs(fmt) // 8))
@@ -1,9 +1,10 @@
+import os
 import sys
 import time
 import pygame
 
 try:
-    import settings as S
+    from core import settings as S
 except Exception:
     class S:
         WIDTH, HEIGHT = 1280, 720
@@ -30,13 +31,17 @@ try:
     from scenes.radar import Radar
     from scenes.debug_menu import DebugMenu
     from scenes.pause_menu import PauseMenu
+    from scenes.profiler_overlay import ProfilerOverlay
+    from scenes.loading_screen import LoadingScreen
     from world.test_level import TestLevel
     from .assets import Assets
 except Exception:
     HUD = type("HUD", (), {"__init__": lambda self, g: None, "draw": lambda self, s: None, "handle_event": lambda self, e: False})
     SpellsWindow = type("SpellsWindow", (), {"__init__": lambda self, g: None, "draw": lambda self, s: None, "handle_event": lambda self, e: False})
-    Radar = type("Radar", (), {"__init__": lambda self, g: None, "draw": lambda self, s: None})
+    Radar = type("Radar", (), {"__init__": lambda self, g: None, "draw": lambda self, s, force=False: None})
     DebugMenu = type("DebugMenu", (), {"__init__": lambda self, g: None, "draw": lambda self, s: None, "handle_event": lambda self, e: None})
+    ProfilerOverlay = type("ProfilerOverlay", (), {"__init__": lambda self, g: None, "draw": lambda self, s: None})
+    LoadingScreen = type("LoadingScreen", (), {"__init__": lambda self, g: None, "draw": lambda self, s, l: s.fill((0, 0, 0))})
     PauseMenu = type("PauseMenu", (), {
         "__init__": lambda self, g: setattr(self, "confirm_open", False) or setattr(self, "quit_confirmed", False),
         "reset": lambda self: (setattr(self, "confirm_open", False), setattr(self, "quit_confirmed", False)),
@@ -51,26 +56,42 @@ except Exception:
         def handle_world_click(self, pos, spell):
             if self.enemy_sprites: self.enemy_sprites.pop()
         def update(self, dt): pass
-        def draw(self, screen): screen.fill((28, 30, 34))
+        def draw(self, screen, alpha=1.0): screen.fill((28, 30, 34))
         def reset_world(self): self.__init__(None)
     TestLevel = _DummyWorld
     class Assets:
         def __init__(self):
             self.images = {"btn_spell": object(), "spark": object()}
-            self.fonts = {"ui": pygame.font.SysFont("consolas", 18)}
+            self.fonts = {"ui": pygame.font.SysFont("consolas", 18), "big": pygame.font.SysFont("consolas", 42)}
         def load(self): pass
+        def text(self, font, text, color, antialias=True): return font.render(text, antialias, color)
 
 # NEW: central audio manager
 from core.audio import AudioManager
+from core.profiler import FrameProfiler
+from core.loader import AssetLoader
+from core.replay import InputRecorder, Replay
+
+# Simulation tick (see core/settings.py)
+FIXED_UPS = getattr(S, "FIXED_UPS", 120)
+FIXED_DT = 1.0 / FIXED_UPS
+MAX_TICKS_PER_FRAME = getattr(S, "MAX_TICKS_PER_FRAME", 8)
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless: bool = False):
+        # Headless: SDL dummy drivers, no music, no window; drive with run_headless()
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
         pygame.init()
         pygame.key.set_repeat(0)
         self.screen = pygame.display.set_mode((S.WIDTH, S.HEIGHT))
         pygame.display.set_caption(getattr(S, "TITLE", "Game"))
 
         self.clock = pygame.time.Clock()
+        self.profiler = FrameProfiler()
         self.running = True
         self.game_over = False
         self.win = False
@@ -84,8 +105,18 @@ class Game:
         if missing:
             raise RuntimeError(f"Missing asset keys: {sorted(missing)}")
 
-        # World & UI
-        self.world = TestLevel(self)
+        # ---- AudioManager setup ----
+        self.audio = AudioManager(music_enabled=not headless)
+
+        # Images and audio decode on worker threads behind a loading screen;
+        # the level is built once they are in (see _finish_loading)
+        self.loader = AssetLoader(self.assets, self.audio)
+        self._queue_assets(music=not headless)
+        self.loading_screen = LoadingScreen(self)
+        self.world = None
+        self._on_loaded = []
+
+        # UI
         self.radar = Radar(self)
         self.hud = HUD(self)
         self.windows = {"spells": SpellsWindow(self)}
@@ -100,24 +131,82 @@ class Game:
         # Pause menu
         self.pause_menu = PauseMenu(self)
 
+        # Frame profiler (toggled from the debug menu; hooks are no-ops while off)
+        self.profiler_overlay = ProfilerOverlay(self)
+
         # Misc
         self.selected_spell = None
         self.msg = ""
         self.font = getattr(self.assets, "fonts", {}).get("ui") or pygame.font.SysFont("consolas", 18)
+        self.big_font = getattr(self.assets, "fonts", {}).get("big") or pygame.font.SysFont("consolas", 42)
+        self._dim = None  # shared translucent backdrop for game over / win
+
+        # Retained rendering: only changed screen regions are pushed each frame
+        self._world_rect = pygame.Rect(S.WORLD_RECT)
+        self._radar_rect = pygame.Rect(getattr(S, "RADAR_RECT", S.PANEL_RECT))
+        self._panel_rect = pygame.Rect(S.PANEL_RECT)
+        self._drawn_window = None
+        self._full_redraw = True
+        self._last_overlay_state = None
 
         # Win overlay clickable buttons
         self._win_buttons = {}
         self._win_awaiting_confirm = False
 
-        # ---- AudioManager setup ----
-        self.audio = AudioManager()
+        # Input recording (start_recording); written out when the game exits
+        self.recorder = None
+        self._record_path = None
+
+        # Headless runs have nothing to show, so just block until loaded
+        if headless:
+            self._finish_loading()
+
+    # ---------------- Loading ----------------
+    def _queue_assets(self, music: bool = True):
+        for path in getattr(TestLevel, "SHEETS", ()):
+            self.loader.add_sheet(path)
         # Pre-register SFX from settings if you have any listed
         for key, path in getattr(S, "SFX_FILES", {}).items():
-            self.audio.register_sfx(key, path)
+            self.loader.add_sound(key, path)
+        if music:
+            self.loader.add_music(getattr(S, "MUSIC_PATH_LEVEL1", None))
+
+    def _run_loading(self):
+        """Loading screen loop: hand finished assets over each frame until the loader is done."""
+        while self.running and not self.loader.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+            self.loader.poll()
+            self.loading_screen.draw(self.screen, self.loader)
+            pygame.display.flip()
+            self.clock.tick(S.FPS)
+        if self.running:
+            self._finish_loading()
+
+    def _finish_loading(self):
+        self.loader.wait()  # no-op after the loading screen ran to completion
+        self.loader.shutdown()
+        for label, err in self.loader.errors:
+            print(f"Asset failed to load in the background: {label} ({err})")
+
+        self.world = TestLevel(self)
+        self._full_redraw = True
         # Set + start level BGM
         self.audio.set_music(getattr(S, "MUSIC_PATH_LEVEL1", None))
         self.audio.play_music()
 
+        for fn in self._on_loaded:
+            fn(self)
+        self._on_loaded.clear()
+
+    def when_loaded(self, fn):
+        """Call fn(game) once the level exists (right away if it already does)."""
+        if self.world is not None:
+            fn(self)
+        else:
+            self._on_loaded.append(fn)
+
     # ---------------- Utilities ----------------
     def set_window(self, name: str):
         if name in self.windows:
@@ -142,33 +231,33 @@ class Game:
         pygame.draw.rect(self.screen, (40, 0, 0), back, border_radius=4)
         pygame.draw.rect(self.screen, (200, 40, 40), fill, border_radius=4)
         pygame.draw.rect(self.screen, (0, 0, 0), back, 2, border_radius=4)
-        txt = self.font.render(f"HP {getattr(self.world.player,'hp',0)}/{getattr(self.world.player,'max_hp',0)}", True, (255, 255, 255))
+        txt = self.assets.text(self.font, f"HP {getattr(self.world.player,'hp',0)}/{getattr(self.world.player,'max_hp',0)}", (255, 255, 255))
         self.screen.blit(txt, (x + 6, y - 18))
 
     # ---------------- Overlays ----------------
+    def _dim_overlay(self) -> pygame.Surface:
+        if self._dim is None:
+            self._dim = pygame.Surface((S.WIDTH, S.HEIGHT), pygame.SRCALPHA)
+            self._dim.fill((0, 0, 0, 150))
+        return self._dim
+
     def _draw_game_over(self):
-        overlay = pygame.Surface((S.WIDTH, S.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
-        big = pygame.font.SysFont("consolas", 42)
-        t1 = big.render("GAME OVER", True, (255, 220, 220))
-        t2 = self.font.render("Press Esc to quit", True, (220, 220, 220))
+        self.screen.blit(self._dim_overlay(), (0, 0))
+        t1 = self.assets.text(self.big_font, "GAME OVER", (255, 220, 220))
+        t2 = self.assets.text(self.font, "Press Esc to quit", (220, 220, 220))
         self.screen.blit(t1, (S.WIDTH // 2 - t1.get_width() // 2, S.HEIGHT // 2 - 40))
         self.screen.blit(t2, (S.WIDTH // 2 - t2.get_width() // 2, S.HEIGHT // 2 + 10))
 
     def _draw_win(self):
-        overlay = pygame.Surface((S.WIDTH, S.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._dim_overlay(), (0, 0))
 
         w, h = 520, 300
         panel = pygame.Rect((S.WIDTH - w)//2, (S.HEIGHT - h)//2, w, h)
         pygame.draw.rect(self.screen, (18, 18, 20), panel, border_radius=16)
         pygame.draw.rect(self.screen, (80, 80, 90), panel, 2, border_radius=16)
 
-        big = pygame.font.SysFont("consolas", 42)
-        t1 = big.render("YOU WIN!", True, (220, 255, 220))
-        t2 = self.font.render("All enemies defeated", True, (220, 220, 220))
+        t1 = self.assets.text(self.big_font, "YOU WIN!", (220, 255, 220))
+        t2 = self.assets.text(self.font, "All enemies defeated", (220, 220, 220))
         self.screen.blit(t1, (panel.centerx - t1.get_width()//2, panel.y + 34))
         self.screen.blit(t2, (panel.centerx - t2.get_width()//2, panel.y + 92))
 
@@ -183,7 +272,7 @@ class Game:
         for rect, label in [(play_rect, "Play Again"), (quit_rect, "Quit")]:
             pygame.draw.rect(self.screen, (36, 36, 42), rect, border_radius=10)
             pygame.draw.rect(self.screen, (110, 110, 120), rect, 2, border_radius=10)
-            t = self.font.render(label, True, (235, 235, 245))
+            t = self.assets.text(self.font, label, (235, 235, 245))
             self.screen.blit(t, (rect.centerx - t.get_width()//2, rect.centery - t.get_height()//2))
 
         if self._win_awaiting_confirm or getattr(self.pause_menu, "confirm_open", False):
@@ -206,16 +295,203 @@ class Game:
         self.debug_menu_open = False
         self._win_buttons = {}
         self._win_awaiting_confirm = False
+        self._full_redraw = True
 
         # Restart level music
         self.audio.set_music(getattr(S, "MUSIC_PATH_LEVEL1", None))
         self.audio.play_music()
 
+    # ---------------- Render ----------------
+    def _overlay_state(self):
+        return (self.game_over, self.win, self.debug_menu_open, self.paused,
+                getattr(self.pause_menu, "confirm_open", False))
+
+    def _draw_frame(self, alpha: float = 1.0):
+        """Compose one frame onto self.screen and return the rects that changed.
+
+        `alpha` is the leftover fraction of a fixed tick, used by the world to
+        interpolate positions between the last two ticks. Returns None when the
+        whole screen was redrawn (overlay open or just changed). Otherwise it
+        returns a list of dirty rects: the world viewport, the radar when it
+        refreshed, and the right-hand panel only if a widget in it changed.
+        """
+        prof = self.profiler
+        screen = self.screen
+        state = self._overlay_state()
+        full = self._full_redraw or any(state) or state != self._last_overlay_state
+        self._last_overlay_state = state
+        self._full_redraw = False
+        rects = []
+
+        if full:
+            screen.fill(S.BLACK)
+        t = prof.start()
+        self.world.draw(screen, alpha)
+        rects.append(self._world_rect)
+        prof.stop("world", t)
+
+        if full:
+            divider_x = S.WORLD_RECT[2]
+            pygame.draw.line(screen, (50, 50, 50), (divider_x, 0), (divider_x, S.HEIGHT), 2)
+            px, py, pw, ph = S.PANEL_RECT
+            pygame.draw.line(screen, (50, 50, 50), (px, py + ph), (px + pw, py + ph), 2)
+
+        t = prof.start()
+        # the radar refreshes at RADAR_HZ; between refreshes it stays on screen
+        if self.radar.draw(screen, force=full) is not None:
+            rects.append(self._radar_rect)
+        prof.stop("radar", t)
+
+        t = prof.start()
+        # retained panel: the window and the HUD tabs on top of it are only
+        # redrawn when one of them is dirty or the active window changed
+        window = self.active_window
+        if (full or window is not self._drawn_window
+                or getattr(window, "dirty", True) or getattr(self.hud, "dirty", True)):
+            window.draw(screen)
+            self.hud.draw(screen)
+            self._drawn_window = window
+            rects.append(self._panel_rect)
+        self._draw_hp_bar()
+
+        if self.msg:
+            screen.blit(self.assets.text(self.font, self.msg, (255, 255, 0)), (20, S.HEIGHT - 26))
+        prof.stop("ui", t)
+
+        t = prof.start()
+        if self.game_over: self._draw_game_over()
+        if self.win:       self._draw_win()
+        if self.debug_menu_open: self.debug_menu.draw(screen)
+        if self.paused and not (self.game_over or self.win): self.pause_menu.draw(screen)
+        prof.stop("overlays", t)
+
+        if prof.enabled:
+            prof.count("enemies", len(getattr(self.world, "enemies", ())))
+            prof.count("projectiles", len(getattr(self.world, "projectiles", ())))
+            self.profiler_overlay.draw(screen)
+
+        return None if full else rects
+
+    def _present(self, rects):
+        """Push a frame from _draw_frame to the display (whole screen if rects is None)."""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    # ---------------- Headless ----------------
+    def run_headless(self, ticks: int | None = None, seconds: float | None = None,
+                     stop_on_end: bool = True) -> dict:
+        """Step the world at the fixed tick as fast as the CPU allows (no events, draw or pacing).
+
+        Runs `ticks` updates, or for `seconds` of wall time, or until the level
+        ends (player dead / all enemies gone) when `stop_on_end` is set.
+        Returns a summary including ticks per second.
+        """
+        if ticks is None and seconds is None:
+            ticks = FIXED_UPS * 60
+        world = self.world
+        done = 0
+        t0 = time.perf_counter()
+        deadline = t0 + seconds if seconds is not None else None
+
+        while ticks is None or done < ticks:
+            world.update(FIXED_DT)
+            done += 1
+
+            # same transitions as run()
+            if getattr(world.player, "dead", False):
+                self.game_over = True
+            elif not getattr(world, "enemy_sprites", []):
+                self.win = True
+            if stop_on_end and (self.game_over or self.win):
+                break
+            # checking the clock every tick would show up in the measurement
+            if deadline is not None and (done & 63) == 0 and time.perf_counter() >= deadline:
+                break
+
+        elapsed = max(1e-9, time.perf_counter() - t0)
+        return {
+            "ticks": done,
+            "sim_seconds": done * FIXED_DT,
+            "wall_seconds": elapsed,
+            "ticks_per_sec": done / elapsed,
+            "realtime_factor": done * FIXED_DT / elapsed,
+            "outcome": "game_over" if self.game_over else ("win" if self.win else "running"),
+            "player_hp": getattr(world.player, "hp", 0),
+            "enemies_left": len(getattr(world, "enemies", [])),
+        }
+
+    # ---------------- Record / Replay ----------------
+    def start_recording(self, path):
+        """Record per-tick input from a fresh level start; saved to `path` on exit."""
+        self.recorder = InputRecorder(self.world)
+        self.recorder.start()
+        self._record_path = path
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        self.recorder.stop()
+        self.recorder.save(self._record_path)
+        print(f"Recorded {self.recorder.ticks} ticks to {self._record_path}")
+        self.recorder = None
+
+    def run_replay(self, replay: Replay, render: bool = False) -> dict:
+        """Feed a recording back through the fixed tick as fast as possible.
+
+        With `render` every tick is also drawn and presented (no frame
+        limiter), for profiling the draw side of a recorded session; closing
+        the window stops the replay early ("in_sync" is then None). Returns
+        None if the window was closed before the level finished loading.
+        """
+        if self.world is None:
+            self._run_loading()
+        if not self.running or self.world is None:
+            return None
+        world = self.world
+        for name in replay.settings_drift():
+            print(f"Replay: setting {name} differs from the recording; results may diverge")
+        replay.setup(world)
+        self._full_redraw = True
+
+        done = 0
+        t0 = time.perf_counter()
+        for tick in range(len(replay)):
+            replay.apply(world, tick)
+            world.update(FIXED_DT)
+            done += 1
+            if render:
+                if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                    self.running = False
+                    break
+                self._present(self._draw_frame(1.0))
+                self.profiler.end_frame()
+        if done == len(replay):
+            in_sync = replay.finish(world)
+        else:
+            in_sync = None  # stopped before the end: nothing to compare
+            world.player.input_mask = None
+
+        elapsed = max(1e-9, time.perf_counter() - t0)
+        return {
+            "ticks": done,
+            "sim_seconds": done * FIXED_DT,
+            "wall_seconds": elapsed,
+            "ticks_per_sec": done / elapsed,
+            "realtime_factor": done * FIXED_DT / elapsed,
+            "in_sync": in_sync,
+            "player_hp": getattr(world.player, "hp", 0),
+            "enemies_left": len(getattr(world, "enemies", [])),
+        }
+
     # ---------------- Main Loop ----------------
     def run(self):
-        FIXED_UPS = 120
-        FIXED_DT = 1.0 / FIXED_UPS
-        MAX_FRAME = 0.25
+        MAX_FRAME = getattr(S, "MAX_FRAME_TIME", 0.25)
+        interpolate = getattr(S, "RENDER_INTERPOLATION", True)
+
+        if self.world is None:
+            self._run_loading()
 
         prev = time.perf_counter()
         accum = 0.0
@@ -233,7 +509,12 @@ class Game:
             if self._menu_toggle_timer > 0.0:
                 self._menu_toggle_timer = max(0.0, self._menu_toggle_timer - frame)
 
+            prof = self.profiler
+            t_frame = prof.start()
+            self.audio.update(frame)  # music prefetch hand-off, crossfades, queue
+
             # Events
+            t = prof.start()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
@@ -318,14 +599,31 @@ class Game:
                             if pygame.Rect(S.WORLD_RECT).collidepoint(event.pos):
                                 self.world.handle_world_click(event.pos, self.selected_spell)
 
+            prof.stop("events", t)
+
             # Quit confirmed (Pause or Win confirm)
             if (self.paused or self.win) and getattr(self.pause_menu, "quit_confirmed", False):
                 self.running = False
 
             # Fixed updates (play only)
-            while not (self.game_over or self.win or self.debug_menu_open or self.paused) and accum >= (1.0 / 120):
-                self.world.update(1.0 / 120)
-                accum -= (1.0 / 120)
+            t = prof.start()
+            ticks = 0
+            simulating = not (self.game_over or self.win or self.debug_menu_open or self.paused)
+            if simulating:
+                while accum >= FIXED_DT and ticks < MAX_TICKS_PER_FRAME:
+                    self.world.update(FIXED_DT)
+                    accum -= FIXED_DT
+                    ticks += 1
+                if accum >= FIXED_DT:
+                    # over budget: drop whole ticks (slow down) rather than spiral
+                    accum %= FIXED_DT
+                alpha = accum / FIXED_DT if interpolate else 1.0
+            else:
+                # frozen: show the latest state and don't bank time for a catch-up burst
+                accum = 0.0
+                alpha = 1.0
+            prof.stop("update", t)
+            prof.count("ticks", ticks)
 
             # Transitions
             if getattr(self.world.player, "dead", False) and not self.game_over:
@@ -336,30 +634,15 @@ class Game:
                 self.audio.fadeout_music()
 
             # Render
-            self.screen.fill(S.BLACK)
-            self.world.draw(self.screen)
-
-            divider_x = S.WORLD_RECT[2]
-            pygame.draw.line(self.screen, (50, 50, 50), (divider_x, 0), (divider_x, S.HEIGHT), 2)
-            px, py, pw, ph = S.PANEL_RECT
-            pygame.draw.line(self.screen, (50, 50, 50), (px, py + ph), (px + pw, py + ph), 2)
-
-            self.radar.draw(self.screen)
-            self.active_window.draw(self.screen)
-            self.hud.draw(self.screen)
-            self._draw_hp_bar()
-
-            if self.msg:
-                self.screen.blit(self.font.render(self.msg, True, (255, 255, 0)), (20, S.HEIGHT - 26))
-
-            if self.game_over: self._draw_game_over()
-            if self.win:       self._draw_win()
-            if self.debug_menu_open: self.debug_menu.draw(self.screen)
-            if self.paused and not (self.game_over or self.win): self.pause_menu.draw(self.screen)
-
-            pygame.display.flip()
+            rects = self._draw_frame(alpha)
+            t = prof.start()
+            self._present(rects)
+            prof.stop("flip", t)
+            prof.stop("frame", t_frame)
+            prof.end_frame()
             self.clock.tick(S.FPS)
 
+        self.stop_recording()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,91 @@
+# core/loader.py
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pygame
+
+from core import settings as S
+
+class AssetLoader:
+    """Decodes images and audio on worker threads; hands them over on the main thread.
+
+    Jobs start as soon as they are added. Workers only do the slow, thread-safe
+    part (file IO, PNG/audio decoding); `poll()` runs on the main thread each
+    frame and passes finished results to Assets / AudioManager, where surface
+    conversion happens. A job that fails is recorded in `errors` and skipped,
+    so the usual synchronous fallbacks still apply later.
+    """
+    def __init__(self, assets, audio, workers=None):
+        self.assets = assets
+        self.audio = audio
+        n = max(1, int(workers or getattr(S, "LOADER_WORKERS", 4)))
+        self._pool = ThreadPoolExecutor(max_workers=n, thread_name_prefix="assets")
+        self._pending = []   # (label, future, hand_off)
+        self.total = 0
+        self.finished = 0
+        self.current = ""    # label of the last asset handed over
+        self.errors: list[tuple[str, BaseException]] = []
+
+    # ---------- Jobs ----------
+    def _submit(self, label, work, hand_off):
+        self._pending.append((label, self._pool.submit(work), hand_off))
+        self.total += 1
+
+    def add_sheet(self, path):
+        """Sprite sheet / tileset: decoded (or read from the sprite cache) off-thread."""
+        path = str(path)
+        self._submit(path, lambda: self.assets.decode_sheet(path),
+                     lambda surf: self.assets.add_sheet(path, surf))
+
+    def add_sound(self, key: str, path, volume: float = 1.0):
+        if not pygame.mixer.get_init():
+            return
+        path = str(path)
+        self._submit(path, lambda: pygame.mixer.Sound(path),
+                     lambda snd: self.audio.add_sfx(key, snd, volume, path=path))
+
+    def add_music(self, path):
+        """Music track: file read into memory off-thread, streamed from there by the mixer."""
+        if not path:
+            return
+        path = str(path)
+        self._submit(path, lambda: Path(path).read_bytes(),
+                     lambda data: self.audio.add_music(path, data))
+
+    # ---------- Progress ----------
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    @property
+    def progress(self) -> float:
+        return 1.0 if self.total == 0 else self.finished / self.total
+
+    def poll(self) -> int:
+        """Hand over every job that has finished; returns how many were handed over."""
+        handed = 0
+        still = []
+        for job in self._pending:
+            if job[1].done():
+                self._finish(*job)
+                handed += 1
+            else:
+                still.append(job)
+        self._pending = still
+        return handed
+
+    def wait(self):
+        """Block until everything is loaded and handed over."""
+        for job in self._pending:
+            self._finish(*job)
+        self._pending = []
+
+    def _finish(self, label, future, hand_off):
+        try:
+            hand_off(future.result())
+        except Exception as e:
+            self.errors.append((label, e))
+        self.finished += 1
+        self.current = label
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
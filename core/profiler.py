@@ -0,0 +1,76 @@
+# core/profiler.py
+from collections import deque
+from time import perf_counter
+
+class FrameProfiler:
+    """Per-frame phase timings and counters with a rolling history.
+
+    Usage inside the frame loop:
+        t = prof.start()
+        ...work...
+        prof.stop("world.draw", t)
+        prof.count("enemies", n)
+        prof.end_frame()            # once per displayed frame
+
+    While `enabled` is False every call returns immediately, so the hooks can
+    stay in the hot paths permanently.
+    """
+    def __init__(self, history: int = 180):
+        self.enabled = False
+        self.history = int(history)
+        self.phases: dict[str, deque] = {}    # name -> ms per frame
+        self.counters: dict[str, deque] = {}  # name -> value per frame
+        self._cur: dict[str, float] = {}
+        self._counts: dict[str, float] = {}
+
+    def set_enabled(self, on: bool):
+        self.enabled = bool(on)
+        if not self.enabled:
+            self.reset()
+
+    def reset(self):
+        self.phases.clear()
+        self.counters.clear()
+        self._cur.clear()
+        self._counts.clear()
+
+    # ---------- Hooks ----------
+    def start(self) -> float:
+        return perf_counter() if self.enabled else 0.0
+
+    def stop(self, name: str, t0: float):
+        if self.enabled:
+            self._cur[name] = self._cur.get(name, 0.0) + (perf_counter() - t0)
+
+    def count(self, name: str, value):
+        if self.enabled:
+            self._counts[name] = value
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        for name, secs in self._cur.items():
+            if name not in self.phases:
+                self.phases[name] = deque(maxlen=self.history)
+        for name, series in self.phases.items():
+            series.append(self._cur.get(name, 0.0) * 1000.0)
+        for name, value in self._counts.items():
+            series = self.counters.get(name)
+            if series is None:
+                series = self.counters[name] = deque(maxlen=self.history)
+            series.append(value)
+        self._cur.clear()
+        self._counts.clear()
+
+    # ---------- Stats ----------
+    @staticmethod
+    def percentile(series, pct: float) -> float:
+        if not series:
+            return 0.0
+        ordered = sorted(series)
+        k = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[k]
+
+    def latest(self, name: str, default=0):
+        series = self.counters.get(name) or self.phases.get(name)
+        return series[-1] if series else default
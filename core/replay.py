@@ -0,0 +1,194 @@
+# core/replay.py
+import hashlib
+import json
+import struct
+import numpy as np
+
+from core import settings as S
+
+# File layout (little-endian):
+#   header   magic, version, seed, tick count, json length, then the JSON
+#            (settings the simulation depends on + level setup)
+#   inputs   run count, then parallel arrays: uint16 input mask, uint32 run length
+#   clicks   click count, then (uint32 tick, float64 world x, float64 world y, uint8 spell id)
+#   digest   16-byte hash of the world state after the last tick
+MAGIC = b"FBRP"
+VERSION = 1
+_HEADER = struct.Struct("<4sHIII")
+_COUNT = struct.Struct("<I")
+_CLICK = struct.Struct("<IddB")
+
+# settings that change what a tick does; recorded so a replay can flag drift
+SIM_SETTINGS = ("FIXED_UPS", "WORLD_W", "WORLD_H", "PLAYER_MAX_HP", "PLAYER_INVULNERABLE_TIME",
+                "ENEMY_ARCHETYPES", "SPATIAL_PAD", "TILE_SIZE",
+                "REGION_SIZE", "REGION_WAKE_RADIUS", "REGION_SLEEP_RADIUS",
+                "AI_NEAR_RADIUS", "AI_MID_RADIUS", "AI_MID_INTERVAL", "AI_FAR_INTERVAL", "AI_THINK_BUDGET",
+                "FLOW_FIELD_RADIUS", "FLOW_PASSES_PER_TICK", "FLOW_BLOCKED_TILES")
+
+def _sim_settings() -> dict:
+    # JSON round trip so tuples compare equal to what comes back from a file
+    return json.loads(json.dumps({name: getattr(S, name, None) for name in SIM_SETTINGS}))
+
+def state_digest(world) -> bytes:
+    """Hash of the simulated state (player, enemies, projectiles) for checking a replay stayed in sync."""
+    h = hashlib.blake2b(digest_size=16)
+    p = world.player
+    h.update(struct.pack("<ddi?", p.pos.x, p.pos.y, int(p.hp), bool(p.dead)))
+    swarm = world.swarm
+    n = swarm.n
+    h.update(_COUNT.pack(n))
+    h.update(swarm.pos[:n].tobytes())
+    h.update(swarm.hp[:n].tobytes())
+    shots = world.projectiles
+    h.update(_COUNT.pack(shots.n))
+    h.update(shots.pos[:shots.n].tobytes())
+    return h.digest()
+
+class InputRecorder:
+    """Captures the player's input mask every fixed tick plus world clicks, for exact replays.
+
+    Masks are run-length encoded as they arrive (held keys cost one run, not
+    one entry per tick). Clicks are stored in world coordinates with the tick
+    they happened before, so zoom and window size don't matter on replay.
+    `start()` resets the level so recording and replay begin from the same state.
+    """
+    def __init__(self, world):
+        self.world = world
+        self.runs: list[list[int]] = []   # [mask, length]
+        self.clicks: list[tuple] = []     # (tick, wx, wy, spell)
+        self.ticks = 0
+        self.header = {}
+
+    def start(self):
+        world = self.world
+        world.recorder = None
+        world.reset_world()
+        world.recorder = self
+        self.restart()
+
+    def restart(self):
+        """Drop what was recorded; called when the level resets mid-recording."""
+        world = self.world
+        self.runs.clear()
+        self.clicks.clear()
+        self.ticks = 0
+        self.header = {
+            "settings": _sim_settings(),
+            "enemy_count": int(world.enemy_count),
+            "god_mode": bool(getattr(world.player, "god_mode", False)),
+        }
+
+    def tick(self, mask: int):
+        runs = self.runs
+        if runs and runs[-1][0] == mask:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.ticks += 1
+
+    def click(self, wx: float, wy: float, spell):
+        self.clicks.append((self.ticks, float(wx), float(wy), spell))
+
+    def stop(self):
+        if self.world.recorder is self:
+            self.world.recorder = None
+
+    def to_bytes(self) -> bytes:
+        spells = sorted({c[3] for c in self.clicks if c[3]})
+        header = dict(self.header, spells=spells)
+        meta = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        masks = np.array([r[0] for r in self.runs], dtype="<u2")
+        lengths = np.array([r[1] for r in self.runs], dtype="<u4")
+        out = [_HEADER.pack(MAGIC, VERSION, int(self.world.seed), self.ticks, len(meta)), meta,
+               _COUNT.pack(len(self.runs)), masks.tobytes(), lengths.tobytes(),
+               _COUNT.pack(len(self.clicks))]
+        for tick, wx, wy, spell in self.clicks:
+            out.append(_CLICK.pack(tick, wx, wy, spells.index(spell) + 1 if spell else 0))
+        out.append(state_digest(self.world))
+        return b"".join(out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+class Replay:
+    """A loaded recording: expands the inputs to one mask per tick and feeds them back into a level."""
+    def __init__(self, seed: int, header: dict, masks: np.ndarray, clicks: list, digest: bytes):
+        self.seed = seed
+        self.header = header
+        self.masks = masks            # uint16 per tick
+        self.clicks = clicks          # (tick, wx, wy, spell), in tick order
+        self.digest = digest
+        self._next_click = 0
+
+    def __len__(self):
+        return len(self.masks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        magic, version, seed, ticks, meta_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version} (expected {VERSION})")
+        at = _HEADER.size
+        header = json.loads(data[at:at + meta_len].decode("utf-8"))
+        at += meta_len
+
+        (nruns,) = _COUNT.unpack_from(data, at)
+        at += _COUNT.size
+        masks = np.frombuffer(data, dtype="<u2", count=nruns, offset=at)
+        at += masks.nbytes
+        lengths = np.frombuffer(data, dtype="<u4", count=nruns, offset=at)
+        at += lengths.nbytes
+        per_tick = np.repeat(masks, lengths)
+        if len(per_tick) != ticks:
+            raise ValueError(f"replay inputs cover {len(per_tick)} ticks, header says {ticks}")
+
+        (nclicks,) = _COUNT.unpack_from(data, at)
+        at += _COUNT.size
+        spells = header.get("spells", [])
+        clicks = []
+        for _ in range(nclicks):
+            tick, wx, wy, spell = _CLICK.unpack_from(data, at)
+            at += _CLICK.size
+            clicks.append((tick, wx, wy, spells[spell - 1] if spell else None))
+        digest = data[at:at + 16]
+        return cls(seed, header, per_tick, clicks, digest)
+
+    @classmethod
+    def load(cls, path) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def settings_drift(self) -> list[str]:
+        """Names of recorded settings that differ from the current ones."""
+        now = _sim_settings()
+        recorded = self.header.get("settings", {})
+        return [name for name in SIM_SETTINGS if name in recorded and recorded[name] != now.get(name)]
+
+    def setup(self, world):
+        """Put `world` in the recorded starting state."""
+        world.seed = self.seed
+        world.enemy_count = int(self.header.get("enemy_count", world.enemy_count))
+        world.player.god_mode = bool(self.header.get("god_mode", False))
+        world.recorder = None
+        world.reset_world()
+        self._next_click = 0
+
+    def apply(self, world, tick: int):
+        """Feed tick `tick`'s clicks and input mask to `world`; call right before world.update()."""
+        clicks = self.clicks
+        while self._next_click < len(clicks) and clicks[self._next_click][0] <= tick:
+            _, wx, wy, spell = clicks[self._next_click]
+            world.click_world(wx, wy, spell)
+            self._next_click += 1
+        world.player.input_mask = int(self.masks[tick])
+
+    def finish(self, world) -> bool:
+        """Hand input back to the keyboard; True if the world ended where the recording did."""
+        for _, wx, wy, spell in self.clicks[self._next_click:]:
+            world.click_world(wx, wy, spell)  # clicks after the last tick
+        self._next_click = len(self.clicks)
+        world.player.input_mask = None
+        return state_digest(world) == self.digest
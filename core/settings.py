@@ -6,12 +6,29 @@ DEBUG_MENU_ALPHA = 180  # 0..255 translucency
 # ===== Window / UI / Camera (your existing settings stay the same) =====
 WIDTH, HEIGHT = 1280, 720
 FPS = 60
+
+# Fixed-timestep simulation: FIXED_UPS ticks per second; at most
+# MAX_TICKS_PER_FRAME catch-up ticks per displayed frame (past that the game
+# slows down instead of spiralling). Rendering interpolates between the last
+# two ticks with the leftover accumulator fraction.
+FIXED_UPS = 120
+MAX_TICKS_PER_FRAME = 8
+MAX_FRAME_TIME = 0.25            # longest frame (s) fed to the accumulator
+RENDER_INTERPOLATION = True
+TEXT_CACHE_SIZE = 256            # rendered text surfaces kept by Assets.text (LRU)
+SPRITE_CACHE_DIR = ".cache/sprites"  # decoded sprite sheets kept between runs (None = off)
+LOADER_WORKERS = 4               # threads decoding images/audio behind the loading screen
+CHECKPOINT_PATH = ".cache/checkpoint.fbss"  # debug menu world checkpoint (None = memory only)
 TITLE = "Floral Foundations – RS-style UI + Camera"
 
 PANEL_WIDTH = 320
 PANEL_RECT = (WIDTH - PANEL_WIDTH, HEIGHT // 2, PANEL_WIDTH, HEIGHT // 2)
 WORLD_RECT = (0, 0, WIDTH - PANEL_WIDTH, HEIGHT)
 RADAR_RECT = (WIDTH - PANEL_WIDTH, 0, PANEL_WIDTH, HEIGHT // 2)
+RADAR_HZ = 10                    # radar refreshes per second (independent of FPS)
+RADAR_MODE = "auto"              # "auto" | "dots" | "heat"
+RADAR_HEATMAP_THRESHOLD = 1500   # auto: density heatmap above this many enemies
+RADAR_HEAT_CELL = 6              # heatmap cell size in radar pixels
 
 TILE_SIZE = 64
 TILESET_PATH = "assets/tilesets/grass.png"
@@ -20,6 +37,29 @@ DEBUG_TILES = True
 
 WORLD_W, WORLD_H = 3072, 2048
 
+# Ground is baked lazily in square chunks (px, rounded down to whole tiles);
+# at most BG_CHUNK_CACHE chunks stay resident, least recently seen evicted first.
+# Keep the cache above the chunk count of one view at the lowest zoom.
+# Chunks on screen are also kept pre-scaled for the current zoom (BG_SCALED_CACHE).
+BG_CHUNK_SIZE   = 512
+BG_CHUNK_CACHE  = 48
+BG_SCALED_CACHE = 24
+
+# Spatial hash for enemy queries (click picking, projectile hits, proximity).
+# SPATIAL_PAD must cover the largest half-extent of anything stored in it.
+SPATIAL_CELL_SIZE = 128
+SPATIAL_PAD       = 32
+CULL_MARGIN       = 16           # world px beyond the view still drawn (interpolation slack)
+
+# Region streaming: enemies in regions more than REGION_SLEEP_RADIUS regions from
+# the player's region sleep (frozen, not simulated); they wake once within
+# REGION_WAKE_RADIUS. Keep REGION_SIZE * REGION_WAKE_RADIUS above
+# ENEMY_DETECT_RADIUS so only idle enemies are ever frozen.
+# With the default WORLD_W x WORLD_H no region is ever far enough away to sleep.
+REGION_SIZE        = 1024
+REGION_WAKE_RADIUS = 1
+REGION_SLEEP_RADIUS = 2
+
 CAMERA_ZOOM = 2.0
 CAMERA_LERP = 0.15
 
@@ -34,6 +74,21 @@ MUSIC_ENABLED    = True
 MUSIC_VOLUME     = 0.60          # 0.0 - 1.0
 MUSIC_FADE_MS    = 600           # fade in/out ms
 MUSIC_PATH_LEVEL1 = "music/test_level.mp3"   # put your file here
+MUSIC_CROSSFADE_MS = 1200        # AudioManager.crossfade_to / queued track changes
+
+# SFX voice pool: channel 0 is kept for UI sounds, the rest are shared. When
+# every voice is busy a new sound steals the oldest voice of equal or lower
+# priority; a sound past its max_instances restarts its own oldest voice.
+# The same sound started more than once in one fixed tick plays once.
+SFX_CHANNELS     = 16
+SFX_CACHE_MB     = 32            # decoded sounds kept (length x rate x channels x sample size)
+SFX_DEFAULT_PROFILE = {"priority": 1, "max_instances": 4}
+SFX_PROFILES = {
+    "spark":     {"priority": 1, "max_instances": 3},
+    "enemy_hit": {"priority": 0, "max_instances": 4},
+    "enemy_die": {"priority": 2, "max_instances": 3},
+}
+SFX_FILES = {}                   # key -> path, e.g. {"spark": "sounds/spark.wav"}
 
 
 # ===== Debug =====
@@ -50,6 +105,50 @@ ENEMY_ATTACK_DAMAGE    = 12
 ENEMY_ATTACK_COOLDOWN  = 0.60   # seconds between hits per enemy
 ENEMY_ATTACK_RANGE     = 28     # if closer than this OR rect-colliding -> damage
 
+LEVEL_ENEMY_COUNT      = 20     # enemies spawned by TestLevel (and on restart)
+WORLD_SEED             = 1337   # enemy placement RNG seed (stored in input recordings)
+
+# Per-archetype stats for the EnemySwarm (world/swarm.py); "grunt" is the default.
+ENEMY_ARCHETYPES = {
+    "grunt": {
+        "speed":           ENEMY_SPEED,
+        "detect_radius":   ENEMY_DETECT_RADIUS,
+        "attack_range":    ENEMY_ATTACK_RANGE,
+        "attack_cooldown": ENEMY_ATTACK_COOLDOWN,
+        "attack_damage":   ENEMY_ATTACK_DAMAGE,
+        "size":            22,
+        "hp":              100,
+        "color":           (200, 60, 60),
+    },
+}
+ENEMY_SWARM_CAPACITY = 256      # initial slots; the swarm doubles when full
+
+# AI level of detail: enemies re-aim ("think") on a schedule set by their distance
+# to the player at the last think; between thinks they keep their velocity.
+# Near: every tick. Mid (<= AI_MID_RADIUS): every AI_MID_INTERVAL ticks. Far: every
+# AI_FAR_INTERVAL ticks. Only the near band attacks, so AI_NEAR_RADIUS must be at
+# least ENEMY_ATTACK_RANGE plus the distance an enemy and the player can close
+# together in AI_MID_INTERVAL ticks; otherwise a mid-band enemy that reaches attack
+# range can't hit until its next think. Defaults: 28 + (120 + 280 px/s) * 4 / 120.
+AI_NEAR_RADIUS   = 256          # px
+AI_MID_RADIUS    = 960          # px; keep >= ENEMY_DETECT_RADIUS so idle enemies are far
+AI_MID_INTERVAL  = 4            # ticks
+AI_FAR_INTERVAL  = 30           # ticks
+AI_THINK_BUDGET  = 4096         # mid/far thinks per tick at most (near ones always think)
+
+# Flow field: chasing enemies follow one shared path field toward the player over
+# the TILE_SIZE grid, within FLOW_FIELD_RADIUS tiles of the player (beyond it they
+# head straight in), and can't walk into blocked tiles. After the player changes
+# tile the field is rebuilt over the next ticks, FLOW_PASSES_PER_TICK relaxation
+# passes per tick (one pass per tile of the longest path in the window).
+# Inactive while no tile is blocked.
+FLOW_FIELD_RADIUS  = 16         # tiles; keep * TILE_SIZE >= ENEMY_DETECT_RADIUS
+FLOW_PASSES_PER_TICK = 16       # ~0.05 ms per pass at the default radius
+FLOW_BLOCKED_TILES = ()         # (col, row) tiles enemies path around and can't enter
+
+# ===== Projectiles =====
+PROJECTILE_POOL_SIZE = 256      # preallocated slots; the pool doubles when full
+
 # Game states
 STATE_PLAYING = "PLAYING"
 STATE_PAUSED  = "PAUSED"
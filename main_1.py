@@ -1,4 +1,54 @@
+import argparse
+
 from core.game import Game
+from core.replay import Replay
+
+def _parse_args():
+    ap = argparse.ArgumentParser(description="Floral Foundations")
+    ap.add_argument("--headless", action="store_true",
+                    help="no window/audio/frame limiter; step the simulation as fast as possible")
+    ap.add_argument("--ticks", type=int, default=None, help="headless: number of fixed ticks to run")
+    ap.add_argument("--seconds", type=float, default=None, help="headless: wall-clock seconds to run")
+    ap.add_argument("--enemies", type=int, default=None, help="override the level's enemy count")
+    ap.add_argument("--god", action="store_true", help="start with God Mode on (soak runs)")
+    ap.add_argument("--no-stop", action="store_true", help="headless: keep stepping after game over / win")
+    ap.add_argument("--record", metavar="PATH", default=None, help="record per-tick input to PATH (written on exit)")
+    ap.add_argument("--replay", metavar="PATH", default=None,
+                    help="replay a recording as fast as possible and report ticks/s (headless unless --render)")
+    ap.add_argument("--render", action="store_true", help="replay: draw every tick in a window")
+    return ap.parse_args()
 
 if __name__ == "__main__":
-    Game().run()
+    args = _parse_args()
+    if args.replay:
+        game = Game(headless=not args.render)
+        stats = game.run_replay(Replay.load(args.replay), render=args.render)
+        if stats is None:
+            raise SystemExit(0)  # window closed while loading
+        print("replay: {ticks} ticks in {wall_seconds:.2f}s -> {ticks_per_sec:.0f} ticks/s "
+              "({realtime_factor:.1f}x realtime), in_sync={in_sync}, hp={player_hp}, "
+              "enemies_left={enemies_left}".format(**stats))
+        raise SystemExit(1 if stats["in_sync"] is False else 0)
+
+    game = Game(headless=args.headless)
+
+    def _apply_overrides(game):
+        if args.enemies is not None:
+            game.world.enemy_count = args.enemies
+            game.world.reset_world()
+        if args.god:
+            game.world.player.god_mode = True
+        if args.record:
+            game.start_recording(args.record)
+
+    # windowed runs build the level after the loading screen
+    game.when_loaded(_apply_overrides)
+
+    if args.headless:
+        stats = game.run_headless(ticks=args.ticks, seconds=args.seconds, stop_on_end=not args.no_stop)
+        game.stop_recording()
+        print("headless: {ticks} ticks in {wall_seconds:.2f}s -> {ticks_per_sec:.0f} ticks/s "
+              "({realtime_factor:.1f}x realtime), outcome={outcome}, hp={player_hp}, "
+              "enemies_left={enemies_left}".format(**stats))
+    else:
+        game.run()
@@ -1,4 +1,5 @@
 # scenes/debug_menu.py
+from pathlib import Path
 import pygame
 from core import settings as S
 
@@ -7,6 +8,7 @@ class DebugMenu:
         self.game = game
         self.rect = pygame.Rect(0, 0, S.DEBUG_MENU_WIDTH, S.HEIGHT)
         self.font = self.game.assets.fonts["ui"]
+        self.text = self.game.assets.text
         pad = 16
         y0 = 70
         h  = 32
@@ -16,14 +18,21 @@ class DebugMenu:
         self.item_rects = {
             "god_mode":   pygame.Rect(pad, y0, self.rect.w - pad*2, h),
             "kill_all":   pygame.Rect(pad, y0 + h + gap, self.rect.w - pad*2, h),
+            "profiler":   pygame.Rect(pad, y0 + (h + gap) * 2, self.rect.w - pad*2, h),
+            "save_checkpoint": pygame.Rect(pad, y0 + (h + gap) * 3, self.rect.w - pad*2, h),
+            "load_checkpoint": pygame.Rect(pad, y0 + (h + gap) * 4, self.rect.w - pad*2, h),
         }
 
+        # world snapshot (TestLevel.snapshot); also written to CHECKPOINT_PATH so it outlives the session
+        self.checkpoint: bytes | None = None
+        self.checkpoint_path = getattr(S, "CHECKPOINT_PATH", None)
+
     def draw(self, screen):
         panel = pygame.Surface((self.rect.w, self.rect.h), pygame.SRCALPHA)
         panel.fill((20, 20, 24, S.DEBUG_MENU_ALPHA))
         pygame.draw.rect(panel, (0, 0, 0), panel.get_rect(), 2)
 
-        title = self.font.render("DEBUG", True, (230, 230, 230))
+        title = self.text(self.font, "DEBUG", (230, 230, 230))
         panel.blit(title, (16, 20))
 
         # --- God Mode toggle (unchanged styling) ---
@@ -31,17 +40,38 @@ class DebugMenu:
         r = self.item_rects["god_mode"]
         pygame.draw.rect(panel, (50, 50, 60), r, border_radius=6)
         pygame.draw.rect(panel, (0, 0, 0), r, 1, border_radius=6)
-        panel.blit(self.font.render(f"God Mode: {gm}", True, (220, 220, 180)), (r.x + 10, r.y + 6))
+        panel.blit(self.text(self.font, f"God Mode: {gm}", (220, 220, 180)), (r.x + 10, r.y + 6))
 
         # --- Kill All Enemies button (matches the look) ---
         rk = self.item_rects["kill_all"]
         pygame.draw.rect(panel, (50, 50, 60), rk, border_radius=6)
         pygame.draw.rect(panel, (0, 0, 0), rk, 1, border_radius=6)
-        panel.blit(self.font.render("Kill all enemies", True, (220, 220, 180)), (rk.x + 10, rk.y + 6))
+        panel.blit(self.text(self.font, "Kill all enemies", (220, 220, 180)), (rk.x + 10, rk.y + 6))
+
+        # --- Frame profiler overlay toggle ---
+        pf = "ON" if self.game.profiler.enabled else "OFF"
+        rp = self.item_rects["profiler"]
+        pygame.draw.rect(panel, (50, 50, 60), rp, border_radius=6)
+        pygame.draw.rect(panel, (0, 0, 0), rp, 1, border_radius=6)
+        panel.blit(self.text(self.font, f"Profiler: {pf}", (220, 220, 180)), (rp.x + 10, rp.y + 6))
 
-        panel.blit(self.font.render("~ to close", True, (170, 170, 170)), (16, self.rect.h - 28))
+        # --- Checkpoints ---
+        for key, label in (("save_checkpoint", "Save checkpoint"), ("load_checkpoint", "Load checkpoint")):
+            rc = self.item_rects[key]
+            pygame.draw.rect(panel, (50, 50, 60), rc, border_radius=6)
+            pygame.draw.rect(panel, (0, 0, 0), rc, 1, border_radius=6)
+            panel.blit(self.text(self.font, label, (220, 220, 180)), (rc.x + 10, rc.y + 6))
+
+        panel.blit(self.text(self.font, "~ to close", (170, 170, 170)), (16, self.rect.h - 28))
         screen.blit(panel, (0, 0))
 
+    def _blocked_by_recording(self, action: str) -> bool:
+        """True (and logs it) while input is being recorded: a replay can't reproduce debug actions."""
+        if getattr(self.game.world, "recorder", None) is None:
+            return False
+        self.game.log(f"{action} is disabled while recording")
+        return True
+
     def _kill_all_enemies(self):
         """Clear all enemies robustly, regardless of Group vs list implementation."""
         world = self.game.world
@@ -87,11 +117,39 @@ class DebugMenu:
         if hasattr(self.game, "log"):
             self.game.log("Debug: Killed all enemies")
 
+    def _save_checkpoint(self):
+        self.checkpoint = self.game.world.snapshot()
+        if self.checkpoint_path:
+            path = Path(self.checkpoint_path)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(self.checkpoint)
+            except OSError as e:
+                print(f"Checkpoint not written to {path}: {e}")
+        self.game.log(f"Checkpoint saved ({len(self.checkpoint) // 1024} KB)")
+
+    def _load_checkpoint(self):
+        data = self.checkpoint
+        if data is None and self.checkpoint_path and Path(self.checkpoint_path).is_file():
+            data = Path(self.checkpoint_path).read_bytes()
+        if data is None:
+            self.game.log("No checkpoint saved")
+            return
+        try:
+            self.game.world.restore(data)
+        except ValueError as e:
+            self.game.log(f"Checkpoint not loaded: {e}")
+            return
+        self.checkpoint = data
+        self.game.log("Checkpoint loaded")
+
     def handle_event(self, event):
         # Clicks
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             # Toggle God Mode
             if self.item_rects["god_mode"].collidepoint(event.pos):
+                if self._blocked_by_recording("God Mode"):
+                    return True
                 p = self.game.world.player
                 p.god_mode = not getattr(p, "god_mode", False)
                 if p.god_mode:
@@ -101,11 +159,30 @@ class DebugMenu:
 
             # Kill all enemies
             if self.item_rects["kill_all"].collidepoint(event.pos):
-                self._kill_all_enemies()
+                if not self._blocked_by_recording("Kill all"):
+                    self._kill_all_enemies()
+                return True
+
+            # Frame profiler overlay
+            if self.item_rects["profiler"].collidepoint(event.pos):
+                prof = self.game.profiler
+                prof.set_enabled(not prof.enabled)
+                self.game.log(f"Profiler {'ON' if prof.enabled else 'OFF'}")
+                return True
+
+            # World checkpoints
+            if self.item_rects["save_checkpoint"].collidepoint(event.pos):
+                self._save_checkpoint()
+                return True
+            if self.item_rects["load_checkpoint"].collidepoint(event.pos):
+                if not self._blocked_by_recording("Loading a checkpoint"):
+                    self._load_checkpoint()
                 return True
 
         # Optional keyboard toggle inside menu (kept from your original)
         if event.type == pygame.KEYDOWN and event.key == pygame.K_g:
+            if self._blocked_by_recording("God Mode"):
+                return True
             p = self.game.world.player
             p.god_mode = not getattr(p, "god_mode", False)
             if p.god_mode:
@@ -12,10 +12,16 @@ class HUD:
         self.tab_buttons = [
             Button((x, y), A.images["btn_spell"], lambda: game.set_window("spells"), "Spells"),
         ]
+        self.rect = self.tab_buttons[0].rect.unionall([b.rect for b in self.tab_buttons])
+
+    @property
+    def dirty(self):
+        return any(b.dirty for b in self.tab_buttons)
 
     def draw(self, screen):
         for b in self.tab_buttons:
             b.draw(screen)
+        return self.rect
 
     def handle_event(self, event):
         for b in self.tab_buttons:
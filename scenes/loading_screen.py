@@ -0,0 +1,34 @@
+# scenes/loading_screen.py
+import pygame
+from core import settings as S
+
+class LoadingScreen:
+    """Title, progress bar and current file while the AssetLoader works."""
+    def __init__(self, game):
+        self.game = game
+        self.font = self.game.assets.fonts["ui"]
+        self.big = self.game.assets.fonts["big"]
+        self.text = self.game.assets.text
+
+        self.bar = pygame.Rect(0, 0, min(520, S.WIDTH - 80), 18)
+        self.bar.center = (S.WIDTH // 2, S.HEIGHT // 2 + 30)
+        self.bg = (16, 18, 22)
+        self.track = (40, 44, 52)
+        self.fill = (110, 190, 120)
+
+    def draw(self, screen, loader):
+        screen.fill(self.bg)
+        title = self.text(self.big, getattr(S, "TITLE", "Loading"), (220, 235, 220))
+        screen.blit(title, title.get_rect(midbottom=(S.WIDTH // 2, self.bar.top - 24)))
+
+        pygame.draw.rect(screen, self.track, self.bar, border_radius=4)
+        done = self.bar.copy()
+        done.w = round(self.bar.w * loader.progress)
+        if done.w > 0:
+            pygame.draw.rect(screen, self.fill, done, border_radius=4)
+        pygame.draw.rect(screen, (0, 0, 0), self.bar, 1, border_radius=4)
+
+        # the current file changes every hand-off, so skip the text cache for it
+        label = f"Loading {loader.finished}/{loader.total}  {loader.current}"
+        t = self.font.render(label, True, (170, 175, 185))
+        screen.blit(t, t.get_rect(midtop=(S.WIDTH // 2, self.bar.bottom + 10)))
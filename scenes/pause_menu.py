@@ -6,7 +6,8 @@ class PauseMenu:
     def __init__(self, game):
         self.game = game
         self.font = self.game.assets.fonts["ui"]
-        self.big  = pygame.font.SysFont("consolas", 42)
+        self.big  = self.game.assets.fonts["big"]
+        self.text = self.game.assets.text
 
         # Main "Quit" button (centered under the PAUSED title)
         bw, bh = 220, 42
@@ -72,13 +73,13 @@ class PauseMenu:
         screen.blit(overlay, (0, 0))
 
         # Title
-        t1 = self.big.render("PAUSED", True, (220, 240, 255))
+        t1 = self.text(self.big, "PAUSED", (220, 240, 255))
         screen.blit(t1, (S.WIDTH//2 - t1.get_width()//2, S.HEIGHT//2 - 80))
 
         # Quit button
         pygame.draw.rect(screen, (50, 50, 60), self.quit_btn, border_radius=8)
         pygame.draw.rect(screen, (0, 0, 0), self.quit_btn, 2, border_radius=8)
-        qtxt = self.font.render("Quit", True, (230, 230, 230))
+        qtxt = self.text(self.font, "Quit", (230, 230, 230))
         screen.blit(qtxt, (self.quit_btn.centerx - qtxt.get_width()//2,
                            self.quit_btn.centery - qtxt.get_height()//2))
 
@@ -88,7 +89,7 @@ class PauseMenu:
             modal.fill((24, 24, 28, 235))
             pygame.draw.rect(modal, (0, 0, 0), modal.get_rect(), 2)
 
-            prompt = self.font.render("Quit to Desktop?", True, (235, 235, 235))
+            prompt = self.text(self.font, "Quit to Desktop?", (235, 235, 235))
             modal.blit(prompt, (modal.get_width()//2 - prompt.get_width()//2, 28))
 
             # buttons
@@ -105,8 +106,8 @@ class PauseMenu:
             pygame.draw.rect(modal, (60, 60, 72), no_r,  border_radius=6)
             pygame.draw.rect(modal, (0, 0, 0),   no_r,  1, border_radius=6)
 
-            ytxt = self.font.render("Yes", True, (230, 230, 230))
-            ntxt = self.font.render("No",  True, (230, 230, 230))
+            ytxt = self.text(self.font, "Yes", (230, 230, 230))
+            ntxt = self.text(self.font, "No", (230, 230, 230))
             modal.blit(ytxt, (yes_r.centerx - ytxt.get_width()//2, yes_r.centery - ytxt.get_height()//2))
             modal.blit(ntxt, (no_r.centerx - ntxt.get_width()//2,  no_r.centery - ntxt.get_height()//2))
 
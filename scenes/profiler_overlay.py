@@ -0,0 +1,94 @@
+# scenes/profiler_overlay.py
+import pygame
+from core import settings as S
+
+# (profiler key, label) in display order; indented labels are sub-phases
+PHASES = (
+    ("events",           "events"),
+    ("update",           "update"),
+    ("tick.player",      "  player"),
+    ("tick.enemies",     "  enemies"),
+    ("tick.projectiles", "  projectiles"),
+    ("tick.camera",      "  camera"),
+    ("world",            "world draw"),
+    ("world.ground",     "  ground"),
+    ("world.sprites",    "  sprites"),
+    ("radar",            "radar"),
+    ("ui",               "panel + HUD"),
+    ("overlays",         "overlays"),
+    ("flip",             "display.flip"),
+)
+# drawn counters are "visible/total" after view culling
+COUNTERS = (("enemies_drawn", "enemies"), ("enemies_awake", "awake"), ("projectiles_drawn", "proj"),
+            ("ticks", "ticks/frame"))
+
+class ProfilerOverlay:
+    """Frame profiler page: rolling frame-time graph, p50/p99 per phase, live counts."""
+    def __init__(self, game):
+        self.game = game
+        self.font = self.game.assets.fonts["ui"]
+        self.text = self.game.assets.text
+        vx, vy, vw, _ = S.WORLD_RECT
+        w = 330
+        self.rect = pygame.Rect(vx + vw - w - 10, vy + 10, w, 0)
+        self.graph_h = 70
+        self.row_h = 18
+        self.rect.h = 16 + self.graph_h + 8 + self.row_h * (len(PHASES) + 4)
+        self.budget_ms = 1000.0 / S.FPS
+
+        self.bg = (14, 14, 18, 200)
+        self.frame_col = (120, 220, 230)
+        self.update_col = (230, 180, 90)
+        self.budget_col = (90, 60, 60)
+        self._panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)  # reused every frame
+
+    def _graph(self, panel, rect, series, color, scale_ms):
+        if len(series) < 2:
+            return
+        n = len(series)
+        step = rect.w / max(1, (n - 1))
+        pts = [(rect.x + i * step, rect.bottom - min(1.0, v / scale_ms) * rect.h) for i, v in enumerate(series)]
+        pygame.draw.lines(panel, color, False, pts, 1)
+
+    def _row(self, panel, y, label, a, b, color):
+        # fixed columns so the table lines up with proportional fonts too
+        indent = 12 if label.startswith(" ") else 0
+        panel.blit(self.text(self.font, label.strip(), color), (8 + indent, y))
+        for text, right in ((a, self.rect.w - 90), (b, self.rect.w - 14)):
+            surf = self.text(self.font, text, color)
+            panel.blit(surf, (right - surf.get_width(), y))
+
+    def draw(self, screen):
+        prof = self.game.profiler
+        panel = self._panel
+        panel.fill(self.bg)
+        pygame.draw.rect(panel, (0, 0, 0), panel.get_rect(), 1)
+
+        # rolling graph: whole frame vs fixed updates, with the frame budget line
+        frame = prof.phases.get("frame", ())
+        scale = max(self.budget_ms * 2, max(frame, default=0.0))
+        g = pygame.Rect(8, 8, self.rect.w - 16, self.graph_h)
+        pygame.draw.rect(panel, (30, 30, 36), g)
+        by = g.bottom - (self.budget_ms / scale) * g.h
+        pygame.draw.line(panel, self.budget_col, (g.x, by), (g.right, by), 1)
+        self._graph(panel, g, frame, self.frame_col, scale)
+        self._graph(panel, g, prof.phases.get("update", ()), self.update_col, scale)
+        panel.blit(self.text(self.font, f"{scale:.0f} ms", (150, 150, 160)), (g.x + 4, g.y + 2))
+
+        y = g.bottom + 8
+        p50 = prof.percentile(frame, 50); p99 = prof.percentile(frame, 99)
+        panel.blit(self.text(self.font, f"frame  p50 {p50:5.2f}  p99 {p99:5.2f} ms", self.frame_col), (8, y))
+        y += self.row_h + 4
+        self._row(panel, y, "phase (ms)", "p50", "p99", (150, 150, 160))
+        y += self.row_h
+        for key, label in PHASES:
+            series = prof.phases.get(key)
+            if not series:
+                continue
+            col = (210, 210, 215) if not label.startswith(" ") else (160, 160, 170)
+            self._row(panel, y, label, f"{prof.percentile(series, 50):.2f}", f"{prof.percentile(series, 99):.2f}", col)
+            y += self.row_h
+
+        counts = "  ".join(f"{label} {prof.latest(key)}" for key, label in COUNTERS)
+        panel.blit(self.text(self.font, counts, (200, 200, 140)), (8, y + 4))
+        screen.blit(panel, self.rect.topleft)
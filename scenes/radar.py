@@ -1,9 +1,23 @@
 # NEW: top-right radar area (same width as panel, top half)
 # scenes/radar.py
+import time
+import numpy as np
 import pygame
 from core import settings as S
 
 class Radar:
+    """Minimap of the whole level, recomposed at RADAR_HZ rather than every frame.
+
+    The static layer is built once, world -> radar mapping is a single
+    scale/offset, and enemy dots are stamped into a pixel array for all
+    enemies at once, so the cost per refresh stays small with thousands of
+    enemies and nothing at all is drawn between refreshes.
+
+    Above RADAR_HEATMAP_THRESHOLD enemies (mode "auto") the dots are replaced
+    by a density heatmap: positions are binned into RADAR_HEAT_CELL-pixel cells
+    in one bincount and colored through a lookup table, so the cost depends on
+    the number of cells, not enemies.
+    """
     def __init__(self, game):
         self.game = game
         self.rect = pygame.Rect(S.RADAR_RECT)
@@ -17,48 +31,177 @@ class Radar:
         self.player_col = (90, 220, 255)   # cyan
         self.enemy_col = (230, 70, 70)     # red
         self.cam_col = (180, 180, 180)     # camera view outline
+        self.dot_radius = 3
+
+        self.interval = 1.0 / max(0.1, float(getattr(S, "RADAR_HZ", 10)))
+        self._next_refresh = 0.0
 
-    def _map_xy(self, x, y, world_w, world_h):
-        """World (x,y) -> radar pixel inside padded rect."""
-        r = self.rect
-        inner = pygame.Rect(r.x + self.pad, r.y + self.pad,
-                            r.w - 2*self.pad, r.h - 2*self.pad)
-        # world coords grow downwards like screen, so linear map is fine
-        rx = inner.x + (x / max(1, world_w)) * inner.w
-        ry = inner.y + (y / max(1, world_h)) * inner.h
-        return int(rx), int(ry)
+        self._base = None   # cached static layer: background, border, crosshairs
+        self._frame = pygame.Surface(self.rect.size, 0, 32)  # last composed radar (32-bit for pixels2d)
+        self._world_size = None
+        self._scale = (1.0, 1.0)
+        self._offset = (float(self.pad), float(self.pad))
+        self._stamp = self._dot_offsets(self.dot_radius)
 
-    def draw(self, screen):
-        world = self.game.world
-        world_w, world_h = world.world_size
+        # heatmap mode: "auto" switches at the threshold, "dots"/"heat" force one
+        self.mode = getattr(S, "RADAR_MODE", "auto")
+        self.heat_threshold = int(getattr(S, "RADAR_HEATMAP_THRESHOLD", 1500))
+        self.heat_cell = max(1, int(getattr(S, "RADAR_HEAT_CELL", 6)))
+        inner_w = self.rect.w - 2*self.pad
+        inner_h = self.rect.h - 2*self.pad
+        self._heat_dims = (-(-inner_w // self.heat_cell), -(-inner_h // self.heat_cell))
+        self._heat_small = pygame.Surface(self._heat_dims, 0, 32)
+        self._heat_small.set_colorkey((0, 0, 0))  # empty cells show the base layer
+        self._heat_big = pygame.Surface((self._heat_dims[0] * self.heat_cell,
+                                         self._heat_dims[1] * self.heat_cell), 0, 32)
+        self._heat_big.set_colorkey((0, 0, 0))
+        self._heat_lut = self._build_heat_lut(self._heat_small)
+        self.showing_heatmap = False
 
+    def _build_base(self) -> pygame.Surface:
+        base = pygame.Surface(self.rect.size).convert()
+        local = base.get_rect()
         # background + border
-        pygame.draw.rect(screen, self.bg, self.rect)
-        pygame.draw.rect(screen, self.border, self.rect, 2)
+        pygame.draw.rect(base, self.bg, local)
+        pygame.draw.rect(base, self.border, local, 2)
 
-        # optional minimal grid
-        gx = self.rect.x + self.pad
-        gy = self.rect.y + self.pad
+        # light crosshairs
+        gx, gy = self.pad, self.pad
         gw = self.rect.w - 2*self.pad
         gh = self.rect.h - 2*self.pad
+        pygame.draw.line(base, self.grid, (gx, gy + gh//2), (gx + gw, gy + gh//2), 1)
+        pygame.draw.line(base, self.grid, (gx + gw//2, gy), (gx + gw//2, gy + gh), 1)
+        return base
 
-        # light crosshairs
-        pygame.draw.line(screen, self.grid, (gx, gy + gh//2), (gx + gw, gy + gh//2), 1)
-        pygame.draw.line(screen, self.grid, (gx + gw//2, gy), (gx + gw//2, gy + gh), 1)
+    @staticmethod
+    def _dot_offsets(radius: int):
+        """Pixel offsets covered by pygame.draw.circle(radius), as (dx, dy) int arrays."""
+        size = 2 * radius + 3
+        probe = pygame.Surface((size, size))
+        probe.fill((0, 0, 0))
+        c = size // 2
+        pygame.draw.circle(probe, (255, 255, 255), (c, c), radius)
+        xs, ys = np.nonzero(pygame.surfarray.array_red(probe))
+        return xs - c, ys - c
+
+    @staticmethod
+    def _build_heat_lut(surf) -> np.ndarray:
+        """256 mapped colors: 0 is the colorkey, then dark red -> orange -> yellow -> white."""
+        stops = np.array([(0.0, 90, 20, 24), (0.45, 220, 60, 40), (0.75, 250, 170, 40), (1.0, 255, 250, 220)])
+        t = np.linspace(0.0, 1.0, 256)
+        rgb = np.stack([np.interp(t, stops[:, 0], stops[:, k]) for k in (1, 2, 3)], axis=1).astype(np.int64)
+        lut = np.array([surf.map_rgb(tuple(c)) for c in rgb], dtype=np.uint32)
+        lut[0] = surf.map_rgb((0, 0, 0))
+        return lut
+
+    def use_heatmap(self, enemy_count: int) -> bool:
+        if self.mode == "auto":
+            return enemy_count > self.heat_threshold
+        return self.mode == "heat"
+
+    def _set_world_size(self, world_w, world_h):
+        """Precompute world -> radar-local mapping: local = offset + world * scale."""
+        self._world_size = (world_w, world_h)
+        inner_w = self.rect.w - 2*self.pad
+        inner_h = self.rect.h - 2*self.pad
+        self._scale = (inner_w / max(1, world_w), inner_h / max(1, world_h))
+
+    def _map_xy(self, x, y):
+        """World (x,y) -> radar-local pixel inside the padded rect."""
+        (sx, sy), (ox, oy) = self._scale, self._offset
+        return int(ox + x * sx), int(oy + y * sy)
+
+    def _enemy_positions(self, world) -> np.ndarray:
+        swarm = getattr(world, "swarm", None)
+        if swarm is not None:
+            return swarm.pos[:swarm.n]
+        return np.array([(e.pos.x, e.pos.y) for e in world.enemies], dtype=np.float64).reshape(-1, 2)
+
+    def _plot_dots(self, surf, pos: np.ndarray, color):
+        """Stamp a dot for every row of `pos` (world coords) with array writes."""
+        if len(pos) == 0:
+            return
+        (sx, sy), (ox, oy) = self._scale, self._offset
+        # same truncation as int() in _map_xy
+        cx = (ox + pos[:, 0] * sx).astype(np.int64)
+        cy = (oy + pos[:, 1] * sy).astype(np.int64)
+        w, h = surf.get_size()
+        px = pygame.surfarray.pixels2d(surf)
+        try:
+            value = surf.map_rgb(color)
+            for dx, dy in zip(*self._stamp):
+                x = cx + dx
+                y = cy + dy
+                keep = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+                px[x[keep], y[keep]] = value
+        finally:
+            del px  # unlock the surface
+
+    def _plot_heatmap(self, surf, pos: np.ndarray):
+        """Bin `pos` into heat cells (one bincount) and draw the color-mapped density."""
+        gw, gh = self._heat_dims
+        (sx, sy), cell = self._scale, self.heat_cell
+        ix = np.floor(pos[:, 0] * (sx / cell)).astype(np.int64)
+        iy = np.floor(pos[:, 1] * (sy / cell)).astype(np.int64)
+        keep = (ix >= 0) & (ix < gw) & (iy >= 0) & (iy < gh)
+        counts = np.bincount(ix[keep] * gh + iy[keep], minlength=gw * gh).reshape(gw, gh)
+
+        # log scale against the densest cell so sparse areas stay visible
+        peak = max(4, int(counts.max(initial=0)))
+        level = np.log1p(counts) * (254.0 / np.log1p(peak))
+        level = np.where(counts > 0, 1 + level.astype(np.int64), 0)
+        pygame.surfarray.blit_array(self._heat_small, self._heat_lut[np.minimum(level, 255)])
+
+        inner_w = self.rect.w - 2*self.pad
+        inner_h = self.rect.h - 2*self.pad
+        pygame.transform.scale(self._heat_small, self._heat_big.get_size(), self._heat_big)
+        surf.blit(self._heat_big, (self.pad, self.pad), (0, 0, inner_w, inner_h))
+
+    def _compose(self, world):
+        frame = self._frame
+        frame.blit(self._base, (0, 0))
+
+        pos = self._enemy_positions(world)
+        self.showing_heatmap = self.use_heatmap(len(pos))
+        if self.showing_heatmap:
+            # density underneath, so the camera box and player stay readable
+            self._plot_heatmap(frame, pos)
 
         # camera view rectangle (map the camera’s world rect corners into radar)
         cam_rect = world.camera.view_rect()
-        tl = self._map_xy(cam_rect.left,  cam_rect.top,    world_w, world_h)
-        br = self._map_xy(cam_rect.right, cam_rect.bottom, world_w, world_h)
+        tl = self._map_xy(cam_rect.left,  cam_rect.top)
+        br = self._map_xy(cam_rect.right, cam_rect.bottom)
         cam_px = pygame.Rect(min(tl[0], br[0]), min(tl[1], br[1]),
                              abs(br[0]-tl[0]), abs(br[1]-tl[1]))
-        pygame.draw.rect(screen, self.cam_col, cam_px, 1)
+        pygame.draw.rect(frame, self.cam_col, cam_px, 1)
 
         # player dot
-        px, py = self._map_xy(world.player.pos.x, world.player.pos.y, world_w, world_h)
-        pygame.draw.circle(screen, self.player_col, (px, py), 3)
+        pygame.draw.circle(frame, self.player_col, self._map_xy(world.player.pos.x, world.player.pos.y),
+                           self.dot_radius)
 
         # enemy dots
-        for e in world.enemies:
-            ex, ey = self._map_xy(e.pos.x, e.pos.y, world_w, world_h)
-            pygame.draw.circle(screen, self.enemy_col, (ex, ey), 3)
+        if not self.showing_heatmap:
+            self._plot_dots(frame, pos, self.enemy_col)
+
+    def draw(self, screen, force: bool = False):
+        """Blit the radar if a refresh is due or `force` is set; returns the rect drawn, else None.
+
+        `force` (a full-screen redraw) re-blits the last composed radar without
+        recomposing it early.
+        """
+        now = time.perf_counter()
+        due = now >= self._next_refresh
+        if not (due or force):
+            return None  # last refresh is still on screen
+
+        if due:
+            self._next_refresh = now + self.interval
+            world = self.game.world
+            # static layer (background, border, crosshairs) is built once
+            if self._base is None:
+                self._base = self._build_base()
+            if self._world_size != tuple(world.world_size):
+                self._set_world_size(*world.world_size)
+            self._compose(world)
+        screen.blit(self._frame, self.rect)
+        return self.rect
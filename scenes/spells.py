@@ -1,4 +1,5 @@
 # scenes/spells.py
+import pygame
 from ui.window import Window
 from ui.button import Button
 
@@ -11,16 +12,21 @@ class SpellsWindow(Window):
 
         self.spark_btn = Button((ox + 20, oy + 60), A.images["spark"], on_click=self.select_spark, hint="Spark")
         self.children += [self.spark_btn]
+        self._drawn_spell = None  # selection shown in the cached surface
 
     def select_spark(self):
         # Set the currently selected spell on the Game
         self.game.selected_spell = "spark"
         self.game.log("Spark selected")
 
-    def draw(self, surf):
-        super().draw(surf)
+    @property
+    def dirty(self):
+        return super().dirty or self._drawn_spell != getattr(self.game, "selected_spell", None)
+
+    def render(self, surf, offset=(0, 0)):
+        super().render(surf, offset)
         # simple selection outline
-        if getattr(self.game, "selected_spell", None) == "spark":
-            r = self.spark_btn.rect.inflate(6, 6)
-            import pygame
+        self._drawn_spell = getattr(self.game, "selected_spell", None)
+        if self._drawn_spell == "spark":
+            r = self.spark_btn.rect.inflate(6, 6).move(offset)
             pygame.draw.rect(surf, (255, 255, 120), r, 2)
@@ -0,0 +1,27 @@
+# tests/test_audio.py
+import pygame
+
+from core.game import Game, FIXED_DT
+
+def _game_with_sound(key):
+    game = Game(headless=True)
+    game.audio.add_sfx(key, pygame.mixer.Sound(buffer=bytes(4000)))
+    return game
+
+def test_same_sound_plays_once_per_tick():
+    game = _game_with_sound("enemy_hit")
+    audio, world = game.audio, game.world
+    started = audio._serial
+    audio.play_sfx("enemy_hit")
+    audio.play_sfx("enemy_hit")  # same tick: coalesced
+    assert audio._serial == started + 1
+    world.update(FIXED_DT)
+    audio.play_sfx("enemy_hit")  # next tick: plays again
+    assert audio._serial == started + 2
+
+def test_ui_channel_without_reserved_channel_is_ignored():
+    game = _game_with_sound("click")
+    audio = game.audio
+    audio.ui_channel = None
+    audio.play_sfx("click", channel="ui")
+    assert "click" not in audio._tick_sfx
@@ -0,0 +1,106 @@
+# tests/test_flowfield.py
+import time
+
+import numpy as np
+
+from core import settings as S
+from core.game import Game, FIXED_DT
+from core.replay import state_digest
+from world import player as P
+from world.flowfield import FlowField
+
+TILE = 64
+
+def _serpentine(passes_per_tick=None) -> FlowField:
+    """48x32 tiles of walls every other column, gaps alternating top and bottom."""
+    field = FlowField((48 * TILE, 32 * TILE), TILE, 16, passes_per_tick)
+    for col in range(2, 48, 2):
+        gap = 0 if (col // 2) % 2 else 31
+        for row in range(32):
+            if row != gap:
+                field.set_blocked(col, row)
+    return field
+
+def _center(col, row):
+    return col * TILE + TILE / 2, row * TILE + TILE / 2
+
+def test_rebuild_after_one_tile_stays_within_the_pass_budget():
+    x, y = _center(25, 16)
+    full = _serpentine(passes_per_tick=10 ** 6)
+    t = time.perf_counter()
+    assert full.update(x, y)
+    full_ms = time.perf_counter() - t
+
+    field = _serpentine()
+    while not field.update(x, y):
+        pass
+    worst, ticks = 0.0, 0
+    while True:
+        t = time.perf_counter()
+        done = field.update(x + TILE, y)
+        worst = max(worst, time.perf_counter() - t)
+        ticks += 1
+        assert field.passes <= field.passes_per_tick
+        if done:
+            break
+    assert ticks > 1  # the serpentine needs more passes than one tick's budget
+    assert worst < full_ms / 4
+
+    ref = _serpentine(passes_per_tick=10 ** 6)
+    ref.update(x + TILE, y)
+    assert field.goal == ref.goal
+    assert np.array_equal(field.cost, ref.cost)
+    assert np.array_equal(field.dirs, ref.dirs)
+
+def test_resolve_keeps_centers_out_of_blocked_tiles():
+    field = _serpentine()
+    old = np.array([_center(1, 5), _center(1, 5), _center(2, 5)])
+    new = old + (TILE, TILE / 4)
+    field.resolve(old, new)
+    assert not field.blocked_at(new[:2]).any()
+    assert new[0, 1] == old[0, 1] + TILE / 4  # slid along the wall
+    assert new[2, 0] == old[2, 0] + TILE      # spawned inside a wall: free to leave
+
+def _walled_level():
+    saved = S.FLOW_BLOCKED_TILES
+    S.FLOW_BLOCKED_TILES = [(20, row) for row in range(4, 28)] + [(30, row) for row in range(0, 24)]
+    try:
+        game = Game(headless=True)
+    finally:
+        S.FLOW_BLOCKED_TILES = saved
+    world = game.world
+    world.player.god_mode = True
+    # a ring of chasers around the player, so they steer by the field from the first tick
+    px, py = world.player.pos
+    for k in range(48):
+        a = 2 * np.pi * k / 48
+        world.swarm.spawn(px + 300 * np.cos(a), py + 300 * np.sin(a))
+    world.enemy_sprites.add(*world.swarm.views)
+    world.streamer.mark_dirty()
+    world.player.input_mask = P.IN_RIGHT | P.IN_RUN
+    return world
+
+def test_enemies_never_enter_blocked_tiles():
+    world = _walled_level()
+    swarm, flow = world.swarm, world.flow
+    inside = flow.blocked_at(swarm.pos[:swarm.n])
+    for _ in range(600):
+        world.update(FIXED_DT)
+        now = flow.blocked_at(swarm.pos[:swarm.n])
+        assert not (now & ~inside[:swarm.n]).any()
+
+def test_restore_mid_rebuild_continues_identically():
+    world = _walled_level()
+    for _ in range(200):
+        world.update(FIXED_DT)
+        if world.flow.state()[1] is not None:
+            break
+    assert world.flow.state()[1] is not None  # a build is in progress
+    blob = world.snapshot()
+    for _ in range(300):
+        world.update(FIXED_DT)
+    expected = state_digest(world)
+    world.restore(blob)
+    for _ in range(300):
+        world.update(FIXED_DT)
+    assert state_digest(world) == expected
@@ -0,0 +1,44 @@
+# tests/test_replay.py
+import os
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+from core.game import Game, FIXED_DT
+from core.replay import InputRecorder, Replay
+
+def _recording(ticks=30) -> Replay:
+    game = Game(headless=True)
+    rec = InputRecorder(game.world)
+    rec.start()
+    for _ in range(ticks):
+        game.world.update(FIXED_DT)
+    rec.stop()
+    return Replay.from_bytes(rec.to_bytes())
+
+def test_replay_stays_in_sync():
+    replay = _recording()
+    stats = Game(headless=True).run_replay(replay)
+    assert stats["ticks"] == len(replay)
+    assert stats["in_sync"] is True
+
+def test_window_closed_while_loading_returns_none(monkeypatch):
+    replay = _recording()
+    game = Game()
+    # keep the loading screen up until the QUIT is handled, however fast the workers are
+    monkeypatch.setattr(type(game.loader), "done", property(lambda self: False))
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    assert game.run_replay(replay, render=True) is None
+    assert game.world is None
+
+def test_window_closed_during_render_stops_replay():
+    replay = _recording()
+    game = Game()
+    game._run_loading()
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    stats = game.run_replay(replay, render=True)
+    assert stats["ticks"] == 1
+    assert stats["in_sync"] is None
+    assert not game.running
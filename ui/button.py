@@ -2,14 +2,36 @@ import pygame
 
 class Button:
     def __init__(self, pos, image, on_click=None, hint=""):
-        self.image = image
-        self.rect = self.image.get_rect(topleft=pos)
+        self._image = image
+        self.rect = self._image.get_rect(topleft=pos)
         self.on_click = on_click
         self.hint = hint
-        self.enabled = True
+        self._enabled = True
+        self.dirty = True  # needs to be drawn again (retained UI)
 
-    def draw(self, surf):
-        surf.blit(self.image, self.rect)
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        self._image = image
+        self.rect = image.get_rect(topleft=self.rect.topleft)
+        self.dirty = True
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        if bool(value) != self._enabled:
+            self._enabled = bool(value)
+            self.dirty = True
+
+    def draw(self, surf, offset=(0, 0)):
+        surf.blit(self._image, self.rect.move(offset))
+        self.dirty = False
 
     def handle_event(self, event):
         if not self.enabled:
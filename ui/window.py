@@ -2,20 +2,47 @@ import pygame
 from core import settings as S
 
 class Window:
+    """Panel window drawn in retained mode.
+
+    The frame and children are composed into a cached surface that is only
+    re-rendered while `dirty` (own state changed or a child is dirty); every
+    other frame `draw` is a single blit, and callers can skip even that when
+    the screen still holds the last result.
+    """
     def __init__(self, name):
         self.name = name
         self.rect = pygame.Rect(S.PANEL_RECT)  # right sidebar area (bottom half)
         self.children = []
+        self._cache = None
+        self._dirty = True
 
-    def draw_bg(self, surf):
-        pygame.draw.rect(surf, S.DARK, self.rect)
-        pygame.draw.rect(surf, (0, 0, 0), self.rect, 2)
+    def mark_dirty(self):
+        self._dirty = True
 
-    def draw(self, surf):
-        self.draw_bg(surf)
+    @property
+    def dirty(self):
+        return self._dirty or self._cache is None or any(getattr(c, "dirty", False) for c in self.children)
+
+    def draw_bg(self, surf, offset=(0, 0)):
+        r = self.rect.move(offset)
+        pygame.draw.rect(surf, S.DARK, r)
+        pygame.draw.rect(surf, (0, 0, 0), r, 2)
+
+    def render(self, surf, offset=(0, 0)):
+        """Compose the window onto `surf`; `offset` maps screen coords to `surf` coords."""
+        self.draw_bg(surf, offset)
         for c in self.children:
             if hasattr(c, "draw"):
-                c.draw(surf)
+                c.draw(surf, offset)
+
+    def draw(self, surf):
+        if self.dirty:
+            if self._cache is None or self._cache.get_size() != self.rect.size:
+                self._cache = pygame.Surface(self.rect.size).convert()
+            self.render(self._cache, (-self.rect.x, -self.rect.y))
+            self._dirty = False
+        surf.blit(self._cache, self.rect)
+        return self.rect
 
     def handle_event(self, event):
         for c in self.children:
@@ -0,0 +1,109 @@
+# world/background.py
+from collections import OrderedDict
+import pygame
+
+from core import settings as S
+
+class ChunkedBackground:
+    """Ground layer split into fixed-size chunks that are baked on first sight.
+
+    `tile_at(col, row)` returns the ground tile for a TILE_SIZE cell. Chunks are
+    only built when a view rect touches them and the least recently seen ones are
+    evicted once more than `max_chunks` are resident, so memory and load time do
+    not grow with the world size.
+
+    For drawing at a zoom other than 1, chunks are also kept pre-scaled for the
+    current zoom (a second, smaller LRU that is dropped when the zoom changes),
+    so frames are composed at screen resolution without a full-view scale.
+    """
+    def __init__(self, tile_at, world_size, tile_size=None, chunk_size=None, max_chunks=None):
+        self.tile_at = tile_at
+        self.world_w, self.world_h = world_size
+        self.tile_size = int(tile_size or S.TILE_SIZE)
+        chunk = int(chunk_size or getattr(S, "BG_CHUNK_SIZE", 512))
+        # chunks always hold a whole number of tiles
+        self.chunk_size = max(self.tile_size, chunk - chunk % self.tile_size)
+        self.max_chunks = max(1, int(max_chunks or getattr(S, "BG_CHUNK_CACHE", 48)))
+        self._chunks: "OrderedDict[tuple[int, int], pygame.Surface]" = OrderedDict()
+        self.max_scaled = max(1, int(getattr(S, "BG_SCALED_CACHE", 24)))
+        self._scaled: "OrderedDict[tuple[int, int], pygame.Surface]" = OrderedDict()
+        self._scaled_zoom = None
+
+    def clear(self):
+        self._chunks.clear()
+        self._scaled.clear()
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def _build_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        C, T = self.chunk_size, self.tile_size
+        x0, y0 = cx * C, cy * C
+        w = min(C, self.world_w - x0)
+        h = min(C, self.world_h - y0)
+        surf = pygame.Surface((w, h)).convert()
+        col0, row0 = x0 // T, y0 // T
+        for r in range(-(-h // T)):
+            for c in range(-(-w // T)):
+                surf.blit(self.tile_at(col0 + c, row0 + r), (c * T, r * T))
+        return surf
+
+    def _chunk(self, cx: int, cy: int) -> pygame.Surface:
+        key = (cx, cy)
+        surf = self._chunks.get(key)
+        if surf is None:
+            surf = self._build_chunk(cx, cy)
+            self._chunks[key] = surf
+        else:
+            self._chunks.move_to_end(key)
+        return surf
+
+    def _chunk_range(self, rect: pygame.Rect):
+        C = self.chunk_size
+        cx0 = max(0, rect.left // C)
+        cy0 = max(0, rect.top // C)
+        cx1 = min((self.world_w - 1) // C, (rect.right - 1) // C)
+        cy1 = min((self.world_h - 1) // C, (rect.bottom - 1) // C)
+        return cx0, cy0, cx1, cy1
+
+    def _scaled_chunk(self, cx: int, cy: int, zoom: float) -> pygame.Surface:
+        if zoom == 1.0:
+            return self._chunk(cx, cy)
+        if zoom != self._scaled_zoom:
+            self._scaled.clear()
+            self._scaled_zoom = zoom
+        key = (cx, cy)
+        surf = self._scaled.get(key)
+        if surf is None:
+            # size from the scaled chunk edges, so neighbours meet without gaps
+            C = self.chunk_size
+            x0, y0 = cx * C, cy * C
+            x1 = min(x0 + C, self.world_w)
+            y1 = min(y0 + C, self.world_h)
+            size = (round(x1 * zoom) - round(x0 * zoom), round(y1 * zoom) - round(y0 * zoom))
+            surf = pygame.transform.scale(self._chunk(cx, cy), size)
+            self._scaled[key] = surf
+        else:
+            self._scaled.move_to_end(key)
+        return surf
+
+    def draw(self, dest: pygame.Surface, view: pygame.Rect, zoom: float = 1.0, origin=None):
+        """Blit every chunk overlapping world rect `view` onto `dest`.
+
+        A world point p lands at origin + round(p * zoom); the default origin puts
+        view.topleft at dest (0, 0).
+        """
+        if origin is None:
+            origin = (-round(view.x * zoom), -round(view.y * zoom))
+        ox, oy = origin
+        C = self.chunk_size
+        cx0, cy0, cx1, cy1 = self._chunk_range(view)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                dest.blit(self._scaled_chunk(cx, cy, zoom), (ox + round(cx * C * zoom), oy + round(cy * C * zoom)))
+
+        # evict least recently seen chunks; the ones just drawn are always newest
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        while len(self._scaled) > self.max_scaled:
+            self._scaled.popitem(last=False)
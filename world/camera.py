@@ -7,6 +7,7 @@ class Camera:
         self.zoom = float(zoom)
         self.lerp = float(lerp)
         self.pos = None            # world center
+        self.prev_pos = None       # world center at the start of the last tick
         self.target = None         # sprite with .rect.center
 
     def set_target(self, sprite):
@@ -23,6 +24,10 @@ class Camera:
         desired = pygame.Vector2(self.target.rect.center)
         if self.pos is None:
             self.pos = desired
+        if self.prev_pos is None:
+            self.prev_pos = pygame.Vector2(self.pos)
+        else:
+            self.prev_pos.update(self.pos)
         # framerate-independent smoothing (convert lerp to per-frame alpha)
         alpha = 1 - (1 - self.lerp) ** (dt * 60.0)
         self.pos += (desired - self.pos) * alpha
@@ -34,9 +39,18 @@ class Camera:
         self.pos.x = max(half_w, min(self.world_w - half_w, self.pos.x))
         self.pos.y = max(half_h, min(self.world_h - half_h, self.pos.y))
 
-    def view_rect(self):
+    def snap(self):
+        """Drop interpolation history (after teleports/resets)."""
+        self.prev_pos = None
+
+    def view_rect(self, alpha: float = 1.0):
+        """World rect in view; `alpha` < 1 interpolates from the previous tick's position."""
         w = int(self.viewport.w / self.zoom)
         h = int(self.viewport.h / self.zoom)
-        left = int(self.pos.x - w // 2)
-        top  = int(self.pos.y - h // 2)
+        cx, cy = self.pos
+        if alpha < 1.0 and self.prev_pos is not None:
+            cx = self.prev_pos.x + (cx - self.prev_pos.x) * alpha
+            cy = self.prev_pos.y + (cy - self.prev_pos.y) * alpha
+        left = int(cx - w // 2)
+        top  = int(cy - h // 2)
         return pygame.Rect(left, top, w, h)
@@ -1,56 +1,75 @@
 # world/enemy.py
 import pygame
-from core import settings as S
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, player, size=22, hp=100):
-        super().__init__()
-        self.pos = pygame.Vector2(x, y)
-        self.hp = int(hp)
-        self.player = player
-
-        # simple red box
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        self.image.fill((200, 60, 60))
-        pygame.draw.rect(self.image, (0, 0, 0), self.image.get_rect(), 2)
-        self.rect = self.image.get_rect(center=(round(x), round(y)))
-
-        # AI / combat
-        self.speed = float(S.ENEMY_SPEED)
-        self.detect_radius = float(S.ENEMY_DETECT_RADIUS)
-        self.attack_range = float(S.ENEMY_ATTACK_RANGE)
-        self.attack_cooldown = float(S.ENEMY_ATTACK_COOLDOWN)
-        self._atk_cd = 0.0
+    """Thin per-enemy view over one slot of an EnemySwarm.
 
-    def damage(self, amount: int) -> bool:
-        self.hp -= int(amount)
-        return self.hp <= 0
+    All simulation state (position, hp, cooldowns, stats) lives in the swarm's
+    arrays; the swarm runs the AI for every enemy at once. The view keeps the
+    sprite API (`pos`, `hp`, `rect`, `image`, `kill`) that targeting, the radar
+    and the debug menu rely on. Once killed it is detached from the swarm and
+    keeps answering with its last known state.
+    """
+    def __init__(self, swarm, index, image):
+        super().__init__()
+        self.swarm = swarm
+        self.index = index  # slot in the swarm arrays, None once detached
+        self.image = image
+        self._last_pos = (0.0, 0.0)
+        self._last_hp = 0
 
-    def update(self, dt: float):
-        # cooldown tick
-        if self._atk_cd > 0.0:
-            self._atk_cd = max(0.0, self._atk_cd - dt)
+    # ---------- State views ----------
+    @property
+    def pos(self) -> pygame.Vector2:
+        if self.index is None:
+            return pygame.Vector2(self._last_pos)
+        x, y = self.swarm.pos[self.index]
+        return pygame.Vector2(float(x), float(y))
 
-        # chase player if within detection radius
-        to_p = self.player.pos - self.pos
-        dist2 = to_p.length_squared()
-        if dist2 > 1e-6 and dist2 <= (self.detect_radius * self.detect_radius):
-            dir_vec = to_p.normalize()
-            self.pos += dir_vec * self.speed * dt
+    @pos.setter
+    def pos(self, value):
+        if self.index is None:
+            self._last_pos = (float(value[0]), float(value[1]))
+            return
+        self.swarm.pos[self.index] = (value[0], value[1])
 
-        # sync rect
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
+    @property
+    def hp(self) -> int:
+        if self.index is None:
+            return self._last_hp
+        return int(self.swarm.hp[self.index])
 
-        # ---- DAMAGE PHASE (respect God Mode) ----
-        if self.player.dead:
+    @hp.setter
+    def hp(self, value):
+        if self.index is None:
+            self._last_hp = int(value)
             return
+        self.swarm.hp[self.index] = int(value)
 
-        # Don’t deal damage if player is invulnerable via God Mode
-        if getattr(self.player, "god_mode", False):
-            return
+    @property
+    def size(self) -> int:
+        return self.image.get_width()
+
+    @property
+    def rect(self) -> pygame.Rect:
+        x, y = self.pos
+        r = self.image.get_rect()
+        r.center = (round(x), round(y))
+        return r
+
+    # ---------- Actions ----------
+    def damage(self, amount: int) -> bool:
+        self.hp -= int(amount)
+        return self.hp <= 0
+
+    def kill(self):
+        if self.index is not None:
+            self.swarm.despawn(self)
+        super().kill()
 
-        close = (to_p.length() <= self.attack_range) or self.rect.colliderect(self.player.rect)
-        if close and self._atk_cd <= 0.0:
-            # Only ever damage through the Player API
-            self.player.take_damage(S.ENEMY_ATTACK_DAMAGE)
-            self._atk_cd = self.attack_cooldown
+    def _detach(self):
+        """Called by the swarm when this slot goes away: freeze the last state."""
+        x, y = self.swarm.pos[self.index]
+        self._last_pos = (float(x), float(y))
+        self._last_hp = int(self.swarm.hp[self.index])
+        self.index = None
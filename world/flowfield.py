@@ -0,0 +1,235 @@
+# world/flowfield.py
+import math
+import numpy as np
+
+from core import settings as S
+
+# neighbour steps (dcol, drow, cost); diagonals may not cut a blocked corner
+_STEPS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+          (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)))
+
+class _Build:
+    """One field being relaxed toward `goal`, a bounded number of passes at a time."""
+    def __init__(self, blocked: np.ndarray, goal, radius: int):
+        self.goal = goal
+        gc, gr = goal
+        cols, rows = blocked.shape
+        c0, r0 = max(0, gc - radius), max(0, gr - radius)
+        c1, r1 = min(cols, gc + radius + 1), min(rows, gr + radius + 1)
+        self.origin = (c0, r0)
+        free = ~blocked[c0:c1, r0:r1]
+        free[gc - c0, gr - r0] = True  # the player's own tile is always a valid goal
+        self.walls = ~free
+        self.local_goal = (gc - c0, gr - r0)
+        w, h = self.shape = free.shape
+
+        # padded by one cell of "blocked" so every neighbour shift is a plain slice
+        free_p = np.zeros((w + 2, h + 2), dtype=bool)
+        free_p[1:-1, 1:-1] = free
+        # per step: its cost where the step is allowed (diagonals need both side cells free), else inf
+        self.step_cost = []
+        for dc, dr, step in _STEPS:
+            ok = free_p[1 + dc:w + 1 + dc, 1 + dr:h + 1 + dr].copy()
+            if dc and dr:
+                ok &= free_p[1 + dc:w + 1 + dc, 1:h + 1] & free_p[1:w + 1, 1 + dr:h + 1 + dr]
+            self.step_cost.append(np.where(ok, step, np.inf))
+        self.cost = np.full((w + 2, h + 2), np.inf)
+        self.cost[gc - c0 + 1, gr - r0 + 1] = 0.0
+        self.best = np.empty((w, h))
+        self.via = np.empty((w, h))
+        self.passes = 0
+        self.done = False
+
+    def relax(self, max_passes: int) -> int:
+        """Run up to `max_passes` passes of the integration field; returns how many ran."""
+        w, h = self.shape
+        cost, best, via = self.cost, self.best, self.via
+        inner = cost[1:-1, 1:-1]
+        ran = 0
+        while ran < max_passes and not self.done:
+            best[...] = inner
+            for (dc, dr, _), step in zip(_STEPS, self.step_cost):
+                np.add(cost[1 + dc:w + 1 + dc, 1 + dr:h + 1 + dr], step, out=via)
+                np.minimum(best, via, out=best)
+            best[self.walls] = np.inf
+            best[self.local_goal] = 0.0
+            ran += 1
+            if np.array_equal(best, inner):
+                self.done = True
+            else:
+                inner[...] = best
+        self.passes += ran
+        return ran
+
+class FlowField:
+    """Shared path field toward the player over the TILE_SIZE grid.
+
+    The field is an integration field (8-way path cost to the player's tile)
+    over a window of FLOW_FIELD_RADIUS tiles around the player, relaxed with
+    whole-array passes, plus the unit direction from each tile to its
+    cheapest neighbour. `lookup(pos)` answers for any number of enemies with
+    one array index, so the per-enemy cost doesn't depend on how many enemies
+    follow the field.
+
+    Rebuilding is spread over ticks: when the player is on another tile (or
+    the blocked grid changed) `update` starts a build and runs at most
+    FLOW_PASSES_PER_TICK relaxation passes of it per tick; the new field
+    replaces the current one once it has converged. A build in progress is
+    never restarted, so one finishes every few ticks however fast the player
+    moves, and until then enemies follow the previous field (toward a tile
+    the player just left). The per-tick cost is bounded by the pass budget
+    instead of the longest path in the window.
+
+    Tiles next to the player's tile, outside the window or cut off from the
+    player have no direction; callers steer straight at the player there.
+    Blocked tiles also stop movement: `resolve` keeps enemy centers out of
+    them. While no tile is blocked the field is inactive (straight lines are
+    already the shortest paths); the shipped FLOW_BLOCKED_TILES is empty.
+    """
+    def __init__(self, world_size, tile_size=None, radius=None, passes_per_tick=None):
+        self.tile = int(tile_size or getattr(S, "TILE_SIZE", 64))
+        self.cols = -(-int(world_size[0]) // self.tile)
+        self.rows = -(-int(world_size[1]) // self.tile)
+        self.radius = max(1, int(radius or getattr(S, "FLOW_FIELD_RADIUS", 16)))
+        self.passes_per_tick = max(1, int(passes_per_tick or getattr(S, "FLOW_PASSES_PER_TICK", 16)))
+        self.blocked = np.zeros((self.cols, self.rows), dtype=bool)
+        self.active = False
+
+        self.goal = None         # player tile the field points at
+        self.origin = (0, 0)     # tile of window cell [0, 0]
+        self.cost = np.zeros((0, 0))
+        self.dirs = np.zeros((0, 0, 2))
+        self.has_dir = np.zeros((0, 0), dtype=bool)
+        self.builds = 0          # fields finished
+        self.passes = 0          # relaxation passes run by the last update
+        self._pending: _Build | None = None
+        self._dirty = True
+
+    # ---------- Obstacles ----------
+    def set_blocked(self, col: int, row: int, blocked: bool = True):
+        if 0 <= col < self.cols and 0 <= row < self.rows and self.blocked[col, row] != blocked:
+            self.blocked[col, row] = blocked
+            self._changed()
+
+    def block_rect(self, rect, blocked: bool = True):
+        """Block (or clear) every tile a world-space rect touches."""
+        x, y, w, h = rect
+        t = self.tile
+        c0, r0 = max(0, int(x // t)), max(0, int(y // t))
+        c1, r1 = min(self.cols, int(-(-(x + w) // t))), min(self.rows, int(-(-(y + h) // t)))
+        self.blocked[c0:c1, r0:r1] = blocked
+        self._changed()
+
+    def _changed(self):
+        self.active = bool(self.blocked.any())
+        self._dirty = True
+
+    def blocked_at(self, pos: np.ndarray) -> np.ndarray:
+        """Per row of world positions `pos` ((n, 2)): True if it lies in a blocked tile."""
+        tc = np.floor_divide(pos[:, 0], self.tile).astype(np.int64)
+        tr = np.floor_divide(pos[:, 1], self.tile).astype(np.int64)
+        inside = (tc >= 0) & (tc < self.cols) & (tr >= 0) & (tr < self.rows)
+        out = np.zeros(len(pos), dtype=bool)
+        out[inside] = self.blocked[tc[inside], tr[inside]]
+        return out
+
+    def resolve(self, old: np.ndarray, new: np.ndarray):
+        """Undo the part of each move old -> new (in place on `new`) that enters a blocked tile.
+
+        A blocked move keeps whichever single axis is free (sliding along
+        walls), else stays put. Centers already inside a blocked tile (spawned
+        there) may move freely so they can get out.
+        """
+        if not self.active or len(new) == 0:
+            return
+        hit = np.flatnonzero(self.blocked_at(new) & ~self.blocked_at(old))
+        if hit.size == 0:
+            return
+        o, n = old[hit], new[hit]
+        x_only = np.column_stack((n[:, 0], o[:, 1]))
+        y_only = np.column_stack((o[:, 0], n[:, 1]))
+        x_ok = ~self.blocked_at(x_only)
+        y_ok = ~self.blocked_at(y_only)
+        new[hit] = np.where(x_ok[:, None], x_only, np.where(y_ok[:, None], y_only, o))
+
+    # ---------- Field ----------
+    def tile_of(self, x: float, y: float) -> tuple[int, int]:
+        t = self.tile
+        return (min(self.cols - 1, max(0, int(x // t))), min(self.rows - 1, max(0, int(y // t))))
+
+    def reset(self):
+        """Drop the field and any build in progress (level restart)."""
+        self.goal = None
+        self._pending = None
+        self._dirty = True
+
+    def update(self, x: float, y: float) -> bool:
+        """Advance the field toward the player at world (x, y); returns True if a new field took over."""
+        self.passes = 0
+        if not self.active:
+            return False
+        build = self._pending
+        if build is None:
+            goal = self.tile_of(x, y)
+            if goal == self.goal and not self._dirty:
+                return False
+            self._dirty = False
+            build = self._pending = _Build(self.blocked, goal, self.radius)
+        self.passes = build.relax(self.passes_per_tick)
+        if not build.done:
+            return False
+        self._pending = None
+        self._publish(build)
+        return True
+
+    def _publish(self, build: _Build):
+        self.goal = build.goal
+        self.origin = build.origin
+        self.builds += 1
+        w, h = build.shape
+        cost = build.cost
+        # direction field: toward the cheapest allowed neighbour
+        options = np.stack([cost[1 + dc:w + 1 + dc, 1 + dr:h + 1 + dr] + step
+                            for (dc, dr, _), step in zip(_STEPS, build.step_cost)])
+        pick = options.argmin(axis=0)
+        unit = np.array([(dc, dr) for dc, dr, _ in _STEPS], dtype=np.float64)
+        unit /= np.linalg.norm(unit, axis=1)[:, None]
+        inner = cost[1:-1, 1:-1]
+        self.cost = inner
+        self.dirs = unit[pick]
+        # near the goal (and where it can't be reached) enemies steer straight at the player
+        self.has_dir = np.isfinite(inner) & (inner > 1.5)
+
+    # ---------- Snapshots ----------
+    def state(self) -> tuple:
+        """(goal, pending goal, passes the pending build has run, dirty); goals are None when absent."""
+        pending = self._pending
+        return (self.goal, pending.goal if pending is not None else None,
+                pending.passes if pending is not None else 0, self._dirty)
+
+    def load_state(self, goal, pending_goal, passes: int, dirty: bool):
+        """Recreate the field and the build in progress that `state()` described (same blocked grid)."""
+        self.reset()
+        if goal is not None:
+            build = _Build(self.blocked, tuple(goal), self.radius)
+            build.relax(self.cols * self.rows)  # more passes than any path is long: runs to convergence
+            self._publish(build)
+        if pending_goal is not None:
+            build = _Build(self.blocked, tuple(pending_goal), self.radius)
+            build.relax(passes)
+            self._pending = build
+        self._dirty = dirty
+
+    def lookup(self, pos: np.ndarray):
+        """(directions, ok) for world positions `pos` ((n, 2)); rows where ok is False have no field direction."""
+        n = len(pos)
+        dirs = np.zeros((n, 2))
+        if not self.active or self.goal is None or n == 0:
+            return dirs, np.zeros(n, dtype=bool)
+        w, h = self.has_dir.shape
+        tc = np.floor_divide(pos[:, 0], self.tile).astype(np.int64) - self.origin[0]
+        tr = np.floor_divide(pos[:, 1], self.tile).astype(np.int64) - self.origin[1]
+        ok = (tc >= 0) & (tc < w) & (tr >= 0) & (tr < h)
+        ok[ok] = self.has_dir[tc[ok], tr[ok]]
+        dirs[ok] = self.dirs[tc[ok], tr[ok]]
+        return dirs, ok
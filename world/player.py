@@ -1,27 +1,37 @@
 import pygame
 from core import settings as S
+from core.assets import Assets
 
 # --- speeds ---
 WALK_SPEED = 160
 RUN_MULT   = 1.75  # hold Shift to run
 
 # --- sprite sheet config ---
+SHEET_PATH = "assets/tilesets/walk.png"
 SHEET_ORDER_TOP_TO_BOTTOM = ("up", "left", "down", "right")
 FRAMES_PER_DIR = 8
 FRAME_W = 64
 FRAME_H = 64
 
+# --- input mask bits (one per control; recorded per tick by core/replay.py) ---
+IN_RIGHT = 1 << 0
+IN_LEFT  = 1 << 1
+IN_DOWN  = 1 << 2
+IN_UP    = 1 << 3
+IN_Q     = 1 << 4
+IN_E     = 1 << 5
+IN_RUN   = 1 << 6
+
 # On perfect diagonals, which axis decides the facing?
 DIAGONAL_PREF = "horizontal"  # W+E => RIGHT, W+Q => LEFT, S+D => RIGHT, S+A => LEFT
 
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, pos):
+    def __init__(self, pos, assets=None):
         super().__init__()
 
-        # Load & slice animations using explicit row order
-        sheet = pygame.image.load("assets/tilesets/walk.png").convert_alpha()
-        self.animations = self._slice_4dir_sheet(sheet)
+        # Frames are sliced once per sheet and shared through the Assets atlas
+        self.animations = self._load_animations(assets or Assets())
 
         self.facing = "down"
         self.frame_index = 0
@@ -37,6 +47,8 @@ class Player(pygame.sprite.Sprite):
 
         # runtime state
         self.run_mult = 1.0  # updated each frame based on Shift
+        self.input_mask = None  # set to drive the player from a mask instead of the keyboard (replays)
+        self.input_bits = 0     # mask used on the last tick
 
         # --- combat / health ---
         self.max_hp = S.PLAYER_MAX_HP
@@ -44,36 +56,45 @@ class Player(pygame.sprite.Sprite):
         self.invuln_t = 0.0   # >0 means can't take damage
         self.dead = False
 
-    def _slice_4dir_sheet(self, sheet: pygame.Surface):
-        anims = {d: [] for d in ("up", "down", "left", "right")}
-        for row, direction in enumerate(SHEET_ORDER_TOP_TO_BOTTOM):
-            for col in range(FRAMES_PER_DIR):
-                rect = pygame.Rect(col * FRAME_W, row * FRAME_H, FRAME_W, FRAME_H)
-                frame = pygame.Surface((FRAME_W, FRAME_H), pygame.SRCALPHA)
-                frame.blit(sheet, (0, 0), rect)
-                anims[direction].append(frame)
-        return anims
+    def _load_animations(self, assets: Assets):
+        # explicit row order; returns the shared {direction: [frames]} dict
+        return assets.frames(SHEET_PATH, FRAME_W, FRAME_H, SHEET_ORDER_TOP_TO_BOTTOM, FRAMES_PER_DIR)
 
     # ---------------- Input ----------------
     def handle_event(self, event):
         # Reserved for future hooks
         pass
 
-    def _read_inputs(self):
+    @staticmethod
+    def read_input_mask() -> int:
+        """Current keyboard state as an IN_* bitmask."""
         keys = pygame.key.get_pressed()
+        mask = 0
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: mask |= IN_RIGHT
+        if keys[pygame.K_LEFT]  or keys[pygame.K_a]: mask |= IN_LEFT
+        if keys[pygame.K_DOWN]  or keys[pygame.K_s]: mask |= IN_DOWN
+        if keys[pygame.K_UP]    or keys[pygame.K_w]: mask |= IN_UP
+        if keys[pygame.K_q]: mask |= IN_Q
+        if keys[pygame.K_e]: mask |= IN_E
+        if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]: mask |= IN_RUN
+        return mask
+
+    def _read_inputs(self):
+        mask = self.input_mask if self.input_mask is not None else self.read_input_mask()
+        self.input_bits = mask
 
         # Cardinals
-        right_down = bool(keys[pygame.K_RIGHT] or keys[pygame.K_d])
-        left_down  = bool(keys[pygame.K_LEFT]  or keys[pygame.K_a])
-        down_down  = bool(keys[pygame.K_DOWN]  or keys[pygame.K_s])
-        up_down    = bool(keys[pygame.K_UP]    or keys[pygame.K_w])
+        right_down = bool(mask & IN_RIGHT)
+        left_down  = bool(mask & IN_LEFT)
+        down_down  = bool(mask & IN_DOWN)
+        up_down    = bool(mask & IN_UP)
 
         # Diagonal modifiers (ONLY with W)
-        q_down = bool(keys[pygame.K_q])  # up-left with W
-        e_down = bool(keys[pygame.K_e])  # up-right with W
+        q_down = bool(mask & IN_Q)  # up-left with W
+        e_down = bool(mask & IN_E)  # up-right with W
 
         # Shift-to-run
-        running = bool(keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT])
+        running = bool(mask & IN_RUN)
         self.run_mult = RUN_MULT if running else 1.0
 
         # WASD/Arrows
@@ -1,39 +1,201 @@
 # world/projectile.py
+import numpy as np
 import pygame
-import math
-
-class Projectile:
-    def __init__(self, start_xy, target_xy, speed=700, radius=4, damage=25, color=(170, 120, 255), max_dist=1200):
-        self.pos = pygame.Vector2(start_xy)
-        to = pygame.Vector2(target_xy) - self.pos
-        if to.length_squared() == 0:
-            to = pygame.Vector2(1, 0)
-        self.dir = to.normalize()
-        self.speed = float(speed)
-        self.radius = int(radius)
-        self.damage = int(damage)
-        self.color = color
-        self.traveled = 0.0
-        self.max_dist = float(max_dist)
-
-        # a small rect for cheap collision with enemy.rect
-        d = self.radius * 2
-        self.rect = pygame.Rect(0, 0, d, d)
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
-
-    def update(self, dt):
-        step = self.dir * self.speed * dt
-        self.pos += step
-        self.traveled += step.length()
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
-
-    def alive(self):
-        return self.traveled <= self.max_dist
-
-    def draw_on_layer(self, layer, cam_rect):
-        # draw as a filled circle in screen space (layer coordinates)
-        sx = int(self.pos.x - cam_rect.x)
-        sy = int(self.pos.y - cam_rect.y)
-        pygame.draw.circle(layer, self.color, (sx, sy), self.radius)
-        # optional: a tiny outline
-        pygame.draw.circle(layer, (40, 20, 60), (sx, sy), self.radius, 2)
+
+from core import settings as S
+
+class ProjectilePool:
+    """Preallocated, array-backed storage for every live projectile.
+
+    Live projectiles occupy slots [0, n); spawning appends and retiring swaps
+    the last slot into the hole, so both are O(1) and movement/range expiry run
+    as array operations. Hits are tested against the segment each projectile
+    swept this tick (not just its end position), so fast shots cannot tunnel
+    through small enemies when a frame hitches.
+
+    Each distinct (radius, color) is a "kind" with one pre-rendered sprite, so
+    drawing is a batch of blits instead of two circle rasterizations per shot.
+    """
+    OUTLINE = (40, 20, 60)
+    # per-slot arrays that make up the pool's state (snapshots save [0, n) of each; kind is derived)
+    STATE_FIELDS = ("pos", "prev", "dir", "speed", "traveled", "max_dist", "radius", "damage", "color")
+
+    def __init__(self, capacity=None):
+        cap = max(1, int(capacity or getattr(S, "PROJECTILE_POOL_SIZE", 256)))
+        self.n = 0
+        self.pos      = np.zeros((cap, 2), dtype=np.float64)
+        self.prev     = np.zeros((cap, 2), dtype=np.float64)  # position at the start of the tick
+        self.dir      = np.zeros((cap, 2), dtype=np.float64)
+        self.speed    = np.zeros(cap, dtype=np.float64)
+        self.traveled = np.zeros(cap, dtype=np.float64)
+        self.max_dist = np.zeros(cap, dtype=np.float64)
+        self.radius   = np.zeros(cap, dtype=np.int32)
+        self.damage   = np.zeros(cap, dtype=np.int32)
+        self.color    = np.zeros((cap, 3), dtype=np.uint8)
+        self.kind     = np.zeros(cap, dtype=np.int32)
+        self.kinds: list[tuple[int, tuple]] = []   # kind id -> (radius, color)
+        self._kind_ids: dict[tuple[int, tuple], int] = {}
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def capacity(self) -> int:
+        return self.pos.shape[0]
+
+    def clear(self):
+        self.n = 0
+
+    def _grow(self):
+        cap = self.capacity * 2
+        for name in ("pos", "prev", "dir", "speed", "traveled", "max_dist", "radius", "damage", "color", "kind"):
+            old = getattr(self, name)
+            new = np.zeros((cap,) + old.shape[1:], dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    # ---------- Lifetime ----------
+    def spawn(self, start_xy, target_xy, speed=700, radius=4, damage=25, color=(170, 120, 255), max_dist=1200) -> int:
+        if self.n == self.capacity:
+            self._grow()
+        i = self.n
+        sx, sy = start_xy
+        dx, dy = target_xy[0] - sx, target_xy[1] - sy
+        d2 = dx * dx + dy * dy
+        if d2 == 0:
+            dx, dy, d2 = 1.0, 0.0, 1.0
+        inv = d2 ** -0.5
+        self.pos[i] = (sx, sy)
+        self.prev[i] = (sx, sy)
+        self.dir[i] = (dx * inv, dy * inv)
+        self.speed[i] = speed
+        self.traveled[i] = 0.0
+        self.max_dist[i] = max_dist
+        self.radius[i] = radius
+        self.damage[i] = damage
+        self.color[i] = color
+        self.kind[i] = self._kind_id(int(radius), tuple(int(c) for c in color))
+        self.n = i + 1
+        return i
+
+    def _despawn(self, i: int):
+        last = self.n - 1
+        if i != last:
+            for arr in (self.pos, self.prev, self.dir, self.speed, self.traveled,
+                        self.max_dist, self.radius, self.damage, self.color, self.kind):
+                arr[i] = arr[last]
+        self.n = last
+
+    def retire(self, slots=()):
+        """Drop the given slots (e.g. ones that hit) plus everything past its range."""
+        n = self.n
+        dead = set(int(i) for i in np.flatnonzero(self.traveled[:n] > self.max_dist[:n]))
+        dead.update(slots)
+        # highest first so swap-removal never moves a slot still to be dropped
+        for i in sorted(dead, reverse=True):
+            self._despawn(i)
+
+    def load_state(self, n: int, arrays: dict):
+        """Overwrite slots [0, n) from `arrays` (STATE_FIELDS) in place; kinds are looked up again."""
+        while self.capacity < n:
+            self._grow()
+        for name in self.STATE_FIELDS:
+            getattr(self, name)[:n] = arrays[name]
+        self.n = n
+        if n:
+            pairs, inverse = np.unique(np.column_stack((self.radius[:n], self.color[:n])),
+                                       axis=0, return_inverse=True)
+            ids = [self._kind_id(int(p[0]), tuple(int(c) for c in p[1:])) for p in pairs]
+            self.kind[:n] = np.array(ids, dtype=np.int32)[inverse.reshape(-1)]
+
+    # ---------- Simulation ----------
+    def update(self, dt: float):
+        n = self.n
+        if n == 0:
+            return
+        self.prev[:n] = self.pos[:n]
+        step = self.speed[:n] * dt
+        self.pos[:n] += self.dir[:n] * step[:, None]
+        self.traveled[:n] += step
+
+    def hits(self, targets):
+        """Yield (slot, obj) for the first object each projectile's swept segment touches.
+
+        `targets.query_rect(box)` returns candidate objects with a `.rect` (an
+        EnemySwarm does). Evaluated lazily, so objects the caller kills while
+        consuming hits are not reported for later projectiles in the same tick.
+        """
+        for i in range(self.n):
+            x0, y0 = self.prev[i]
+            x1, y1 = self.pos[i]
+            r = int(self.radius[i])
+            dx, dy = x1 - x0, y1 - y0
+            box = (min(x0, x1) - r, min(y0, y1) - r, abs(dx) + 2 * r, abs(dy) + 2 * r)
+
+            best, best_t = None, 2.0
+            for obj in targets.query_rect(box):
+                t = _segment_hits_rect(x0, y0, dx, dy, obj.rect.inflate(2 * r, 2 * r))
+                if t is not None and t < best_t:
+                    best, best_t = obj, t
+            if best is not None:
+                yield i, best
+
+    # ---------- Rendering ----------
+    def _kind_id(self, radius: int, color: tuple) -> int:
+        key = (radius, color)
+        k = self._kind_ids.get(key)
+        if k is None:
+            k = self._kind_ids[key] = len(self.kinds)
+            self.kinds.append(key)
+        return k
+
+    def sprite(self, kind: int) -> pygame.Surface:
+        """Filled circle with a thin outline, centered at (radius, radius)."""
+        r, color = self.kinds[kind]
+        surf = pygame.Surface((2 * r + 1, 2 * r + 1), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (r, r), r)
+        pygame.draw.circle(surf, self.OUTLINE, (r, r), r, 2)
+        return surf
+
+    def submit(self, batch, cam_rect, alpha: float = 1.0, margin: int = 0) -> int:
+        """Queue projectiles inside world rect `cam_rect` (+ `margin`) on `batch`; returns how many."""
+        n = self.n
+        if n == 0:
+            return 0
+        atlas = batch.atlas
+        for k in range(len(self.kinds)):
+            if ("projectile", k) not in atlas:
+                atlas.add(("projectile", k), self.sprite(k))
+        areas = [batch.area(("projectile", k)) for k in range(len(self.kinds))]
+        pos = self.pos[:n] if alpha >= 1.0 else self.prev[:n] + (self.pos[:n] - self.prev[:n]) * alpha
+
+        # cull in one pass: keep sprites whose box touches the (grown) view
+        reach = self.radius[:n] + margin
+        visible = np.flatnonzero((pos[:, 0] + reach >= cam_rect.left) & (pos[:, 0] - reach < cam_rect.right) &
+                                 (pos[:, 1] + reach >= cam_rect.top) & (pos[:, 1] - reach < cam_rect.bottom))
+        if visible.size == 0:
+            return 0
+        # circle centers truncate toward zero relative to the view, the sprite's center sits `radius` in
+        view_tl = np.array((cam_rect.x, cam_rect.y), dtype=np.int64)
+        topleft = view_tl + (pos[visible] - view_tl).astype(np.int64) - self.radius[visible, None]
+        kind = self.kind[visible].tolist()
+        batch.add_many([areas[k] for k in kind], batch.to_screen(topleft))
+        return int(visible.size)
+
+def _segment_hits_rect(x0, y0, dx, dy, rect):
+    """Entry time t in [0, 1] of the segment (x0,y0)+t*(dx,dy) into `rect`, or None (slab test)."""
+    t_enter, t_exit = 0.0, 1.0
+    for p, d, lo, hi in ((x0, dx, rect.left, rect.right), (y0, dy, rect.top, rect.bottom)):
+        if d == 0.0:
+            if p < lo or p >= hi:
+                return None
+            continue
+        t0 = (lo - p) / d
+        t1 = (hi - p) / d
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > t_enter: t_enter = t0
+        if t1 < t_exit:  t_exit = t1
+        if t_enter > t_exit:
+            return None
+    return t_enter
@@ -0,0 +1,153 @@
+# world/render_batch.py
+import numpy as np
+import pygame
+
+class SpriteAtlas:
+    """One surface holding many small sprites, packed on shelves.
+
+    `add(key, image)` copies the image in once and returns its area Rect; draw
+    calls then blit from `surface` with that area, so every enemy, projectile
+    and effect sprite shares a single source surface. The atlas doubles its
+    height when it runs out of room.
+
+    `scaled(zoom)` returns the whole atlas pre-scaled for a zoom level (built
+    once per zoom and atlas version), so sprites can be blitted straight at
+    screen resolution.
+    """
+    def __init__(self, width=1024, height=256, padding=1):
+        self.width = int(width)
+        self.padding = int(padding)
+        self.surface = self._new_surface(self.width, int(height))
+        self.areas: dict = {}
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_h = 0
+        self.version = 0        # bumped whenever pixels change; invalidates scaled copies
+        self._scaled: dict = {} # zoom -> (version, surface, areas)
+        self.max_zooms = 2
+
+    @staticmethod
+    def _new_surface(w, h) -> pygame.Surface:
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        surf.fill((0, 0, 0, 0))
+        return surf
+
+    def __contains__(self, key):
+        return key in self.areas
+
+    def get(self, key):
+        return self.areas.get(key)
+
+    def add(self, key, image: pygame.Surface) -> pygame.Rect:
+        area = self.areas.get(key)
+        if area is not None:
+            return area
+        w, h = image.get_size()
+        if w + self.padding > self.width:
+            raise ValueError(f"sprite {key!r} is wider than the atlas ({w} > {self.width})")
+        if self._shelf_x + w > self.width:
+            # start a new shelf
+            self._shelf_y += self._shelf_h
+            self._shelf_x = 0
+            self._shelf_h = 0
+        while self._shelf_y + h > self.surface.get_height():
+            self._grow()
+        area = pygame.Rect(self._shelf_x, self._shelf_y, w, h)
+        self.surface.blit(image, area.topleft)
+        self._shelf_x += w + self.padding
+        self._shelf_h = max(self._shelf_h, h + self.padding)
+        self.areas[key] = area
+        self.version += 1
+        return area
+
+    def scaled(self, zoom: float):
+        """(surface, {key: area}) for the atlas scaled by `zoom` (nearest neighbour)."""
+        if zoom == 1.0:
+            return self.surface, self.areas
+        hit = self._scaled.get(zoom)
+        if hit is not None and hit[0] == self.version:
+            return hit[1], hit[2]
+
+        def s(v):
+            return int(round(v * zoom))
+        w, h = self.surface.get_size()
+        surf = pygame.transform.scale(self.surface, (s(w), s(h)))
+        areas = {k: pygame.Rect(s(a.x), s(a.y), s(a.right) - s(a.x), s(a.bottom) - s(a.y))
+                 for k, a in self.areas.items()}
+        if zoom not in self._scaled and len(self._scaled) >= self.max_zooms:
+            self._scaled.pop(next(iter(self._scaled)))
+        self._scaled[zoom] = (self.version, surf, areas)
+        return surf, areas
+
+    def _grow(self):
+        old = self.surface
+        self.surface = self._new_surface(self.width, old.get_height() * 2)
+        self.surface.blit(old, (0, 0))
+
+class RenderBatch:
+    """Collects (source, dest, area) blits for a frame and submits them with one `Surface.blits()` call.
+
+    Commands keep the order they were added in, so later ones draw on top.
+    `begin(zoom, origin)` sets the world -> target mapping used by `to_screen`
+    and `point`: target = origin + round(world * zoom). Atlas sprites come
+    from the atlas copy pre-scaled for that zoom.
+    """
+    def __init__(self, atlas: SpriteAtlas):
+        self.atlas = atlas
+        self.commands: list = []
+        self.zoom = 1.0
+        self.origin = (0, 0)
+        self._src = atlas.surface
+        self._areas = atlas.areas
+        self._version = -1
+
+    def __len__(self):
+        return len(self.commands)
+
+    def begin(self, zoom: float = 1.0, origin=(0, 0)):
+        self.commands.clear()
+        self.zoom = float(zoom)
+        self.origin = (int(origin[0]), int(origin[1]))
+        self._refresh()
+
+    def _refresh(self):
+        self._src, self._areas = self.atlas.scaled(self.zoom)
+        self._version = self.atlas.version
+
+    def area(self, key) -> pygame.Rect:
+        """Area of an atlas sprite at the batch's zoom."""
+        if self._version != self.atlas.version:
+            self._refresh()  # sprites were added since begin()
+        return self._areas[key]
+
+    def point(self, x: int, y: int) -> tuple:
+        """Target position of world point (x, y)."""
+        z = self.zoom
+        return self.origin[0] + round(x * z), self.origin[1] + round(y * z)
+
+    def to_screen(self, xy: np.ndarray) -> np.ndarray:
+        """Target positions of world points `xy` ((n, 2) array) as ints."""
+        if self.zoom == 1.0:
+            return xy.astype(np.int64) + self.origin
+        return np.rint(xy * self.zoom).astype(np.int64) + self.origin
+
+    def add(self, key, x: int, y: int):
+        """Queue one atlas sprite with its top-left at (x, y)."""
+        area = self.area(key)
+        self.commands.append((self._src, (x, y), area))
+
+    def add_surface(self, image: pygame.Surface, x: int, y: int):
+        """Queue a surface that is not in the atlas (e.g. animated player frames)."""
+        self.commands.append((image, (x, y)))
+
+    def add_many(self, areas, xy: np.ndarray):
+        """Queue atlas sprites in bulk: `areas[i]` (from `area()`) is drawn with its top-left at `xy[i]` (int array, (n, 2))."""
+        src = self._src
+        self.commands.extend(zip([src] * len(areas), map(tuple, xy.tolist()), areas))
+
+    def flush(self, target: pygame.Surface):
+        if self.commands:
+            target.blits(self.commands, doreturn=False)
+            self.commands.clear()
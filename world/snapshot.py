@@ -0,0 +1,136 @@
+# world/snapshot.py
+import struct
+import numpy as np
+
+from world.player import SHEET_ORDER_TOP_TO_BOTTOM as FACINGS
+
+# Blob layout (little-endian):
+#   header      magic, version, enemy count, awake enemy count, projectile count
+#   player      pos, invuln timer, hp, dead, facing, animation frame + timer
+#   level       player position at the start of the last tick, cast cooldown, target slot (-1 = none),
+#               swarm AI tick
+#   camera      center, zoom
+#   flow field  goal tile, tile of the build in progress ((-1, -1) = none), its passes so far, dirty
+#   swarm       EnemySwarm.STATE_FIELDS, [0, n) of each array in order
+#   projectiles ProjectilePool.STATE_FIELDS, likewise
+# Only simulation state is stored: surfaces, animations, atlases and caches stay
+# as they are, and god mode (a debug toggle) is left alone.
+MAGIC = b"FBSS"
+VERSION = 4
+_HEADER = struct.Struct("<4sHIII")
+_PLAYER = struct.Struct("<dddi?BHd")
+_LEVEL = struct.Struct("<dddiq")
+_CAMERA = struct.Struct("<ddd")
+_FLOW = struct.Struct("<iiiiI?")
+
+def _pack_arrays(owner, fields, n) -> list[bytes]:
+    out = []
+    for name in fields:
+        arr = getattr(owner, name)[:n]
+        out.append(arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes())
+    return out
+
+def _arrays_size(owner, fields, n) -> int:
+    """Bytes _pack_arrays writes for `n` slots."""
+    return sum(n * (getattr(owner, name).nbytes // len(getattr(owner, name))) for name in fields)
+
+def _unpack_arrays(data, at, owner, fields, n):
+    arrays = {}
+    for name in fields:
+        like = getattr(owner, name)
+        shape = (n,) + like.shape[1:]
+        count = int(np.prod(shape))
+        arr = np.frombuffer(data, dtype=like.dtype.newbyteorder("<"), count=count, offset=at)
+        arrays[name] = arr.reshape(shape)
+        at += arr.nbytes
+    return arrays, at
+
+def take(level) -> bytes:
+    """Serialize `level`'s simulation state into a compact blob."""
+    p = level.player
+    swarm, shots, cam = level.swarm, level.projectiles, level.camera
+    target = level.current_target
+    target_slot = target.index if target is not None and target.index is not None else -1
+    goal, pending, passes, dirty = level.flow.state()
+    out = [
+        _HEADER.pack(MAGIC, VERSION, swarm.n, swarm.n_active, shots.n),
+        _PLAYER.pack(p.pos.x, p.pos.y, p.invuln_t, int(p.hp), bool(p.dead),
+                     FACINGS.index(p.facing), int(p.frame_index), p.anim_timer),
+        _LEVEL.pack(level._player_prev[0], level._player_prev[1], level.cast_timer, target_slot, swarm.tick),
+        _CAMERA.pack(cam.pos.x, cam.pos.y, cam.zoom),
+        _FLOW.pack(*(goal or (-1, -1)), *(pending or (-1, -1)), passes, dirty),
+    ]
+    out += _pack_arrays(swarm, swarm.STATE_FIELDS, swarm.n)
+    out += _pack_arrays(shots, shots.STATE_FIELDS, shots.n)
+    return b"".join(out)
+
+def restore(level, data: bytes):
+    """Put `level` back in the state `data` (from take) describes, reusing its objects.
+
+    Raises ValueError, before touching `level`, if `data` isn't a complete
+    snapshot this level can load.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("not a world snapshot")
+    magic, version, n_enemies, n_awake, n_shots = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a world snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version} (expected {VERSION})")
+    swarm, shots = level.swarm, level.projectiles
+    size = (_HEADER.size + _PLAYER.size + _LEVEL.size + _CAMERA.size + _FLOW.size
+            + _arrays_size(swarm, swarm.STATE_FIELDS, n_enemies) + _arrays_size(shots, shots.STATE_FIELDS, n_shots))
+    if len(data) != size:
+        raise ValueError(f"snapshot is {len(data)} bytes, its header says {size}")
+    if n_awake > n_enemies:
+        raise ValueError(f"snapshot has {n_awake} awake enemies out of {n_enemies}")
+    at = _HEADER.size
+    px, py, invuln, hp, dead, facing, frame, anim_t = _PLAYER.unpack_from(data, at)
+    at += _PLAYER.size
+    prev_x, prev_y, cast_timer, target_slot, ai_tick = _LEVEL.unpack_from(data, at)
+    at += _LEVEL.size
+    cx, cy, zoom = _CAMERA.unpack_from(data, at)
+    at += _CAMERA.size
+    goal_c, goal_r, pending_c, pending_r, passes, flow_dirty = _FLOW.unpack_from(data, at)
+    at += _FLOW.size
+    enemy_arrays, at = _unpack_arrays(data, at, swarm, swarm.STATE_FIELDS, n_enemies)
+    shot_arrays, at = _unpack_arrays(data, at, shots, shots.STATE_FIELDS, n_shots)
+    flow = level.flow
+    for c, r in ((goal_c, goal_r), (pending_c, pending_r)):
+        if c >= flow.cols or r >= flow.rows:
+            raise ValueError(f"snapshot flow field tile {(c, r)} is outside this world")
+    if facing >= len(FACINGS):
+        raise ValueError(f"snapshot player facing {facing} out of range")
+    arch = enemy_arrays["arch"]
+    if n_enemies and not (0 <= arch.min() and arch.max() < len(swarm.arch_images)):
+        raise ValueError(f"snapshot enemy archetypes don't match ENEMY_ARCHETYPES ({len(swarm.arch_images)} defined)")
+
+    # player: state only, the animation frames are already loaded
+    p = level.player
+    p.pos.update(px, py)
+    p.rect.center = (round(px), round(py))
+    p.hp, p.invuln_t, p.dead = hp, invuln, dead
+    p.facing = FACINGS[facing]
+    p.frame_index, p.anim_timer = frame, anim_t
+    p.image = p.animations[p.facing][frame % len(p.animations[p.facing])]
+    level._player_prev = (prev_x, prev_y)
+    level.cast_timer = cast_timer
+
+    # enemies: arrays copied into place, views reused, grid and sleeping regions rebuilt
+    swarm.load_state(n_enemies, enemy_arrays, n_awake)
+    swarm.tick = ai_tick
+    level.streamer.rebuild()
+    level.enemy_sprites.empty()
+    level.enemy_sprites.add(*swarm.views)
+    level.current_target = swarm.views[target_slot] if 0 <= target_slot < swarm.n else None
+
+    shots.load_state(n_shots, shot_arrays)
+
+    # flow field: rebuilt from the goals (the blocked grid comes from settings, not the snapshot)
+    level.flow.load_state((goal_c, goal_r) if goal_c >= 0 else None,
+                          (pending_c, pending_r) if pending_c >= 0 else None, passes, flow_dirty)
+
+    cam = level.camera
+    cam.set_zoom(zoom)
+    cam.pos.update(cx, cy)
+    cam.snap()
@@ -0,0 +1,92 @@
+# world/spatial.py
+import numpy as np
+
+from core import settings as S
+
+class SpatialGrid:
+    """Uniform-grid index over an array of centers, rebuilt in bulk.
+
+    `build(pos)` buckets the rows of an (n, 2) center array by the cell holding
+    them: cell keys are argsorted once (stable, so rows keep their order inside
+    a cell) and each cell owns a contiguous range of the sorted rows. Moving
+    things costs nothing until the next build, and a build is a handful of
+    array operations however many rows changed cell.
+
+    Queries grow the searched area by `pad` (the largest half-extent of anything
+    indexed) so a row whose rect pokes into the query area is never missed, and
+    return candidate row indices; callers still do the exact test.
+    """
+    def __init__(self, cell_size=None, pad=None):
+        self.cell_size = int(cell_size or getattr(S, "SPATIAL_CELL_SIZE", 128))
+        self.pad = int(pad if pad is not None else getattr(S, "SPATIAL_PAD", 32))
+        self.n = 0
+        self._origin = (0, 0)                          # cell of column/row 0
+        self._dims = (0, 0)                            # columns, rows covered
+        self._order = np.zeros(0, dtype=np.int64)      # rows sorted by cell
+        self._starts = [0]                             # cell k owns _order[_starts[k]:_starts[k + 1]]
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.build(np.zeros((0, 2)))
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        cs = self.cell_size
+        return int(x // cs), int(y // cs)
+
+    # ---------- Maintenance ----------
+    def build(self, pos: np.ndarray):
+        """Index the rows of `pos` ((n, 2) centers), replacing whatever was indexed."""
+        n = self.n = len(pos)
+        if n == 0:
+            self._origin, self._dims = (0, 0), (0, 0)
+            self._order = np.zeros(0, dtype=np.int64)
+            self._starts = [0]
+            return
+        # (2, n) so each axis is contiguous (floor of a true divide is cheaper than floor_divide)
+        cx, cy = np.floor(pos / self.cell_size).T.astype(np.int64)
+        ox, oy = int(cx.min()), int(cy.min())
+        cols, rows = int(cx.max()) - ox + 1, int(cy.max()) - oy + 1
+        # column-major keys: a query's rows in one column are one contiguous range
+        keys = (cx - ox) * rows + (cy - oy)
+        if cols * rows <= 1 << 16:
+            keys = keys.astype(np.uint16)  # stable sort of 16-bit keys is a radix sort
+        self._origin = (ox, oy)
+        self._dims = (cols, rows)
+        self._order = np.argsort(keys, kind="stable")
+        starts = np.zeros(cols * rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=cols * rows), out=starts[1:])
+        self._starts = starts.tolist()  # plain ints: queries index it a few times each
+
+    # ---------- Queries ----------
+    @property
+    def order(self) -> np.ndarray:
+        """Indexed rows sorted by cell; `spans` index into this."""
+        return self._order
+
+    def spans(self, rect) -> list[tuple[int, int]]:
+        """(start, end) ranges of `order` holding the rows whose rect may overlap `rect` (x, y, w, h)."""
+        x, y, w, h = rect
+        pad, cs = self.pad, self.cell_size
+        (ox, oy), (cols, rows) = self._origin, self._dims
+        cx0 = max(0, int((x - pad) // cs) - ox)
+        cy0 = max(0, int((y - pad) // cs) - oy)
+        cx1 = min(cols - 1, int((x + w + pad) // cs) - ox)
+        cy1 = min(rows - 1, int((y + h + pad) // cs) - oy)
+        starts = self._starts
+        # one range per column: rows cy0..cy1 of a column are adjacent keys
+        return [(starts[cx * rows + cy0], starts[cx * rows + cy1 + 1])
+                for cx in range(cx0, cx1 + 1)] if cy0 <= cy1 else []
+
+    def query_rect(self, rect) -> np.ndarray:
+        """Rows whose rect may overlap `rect` (x, y, w, h), grouped by cell."""
+        order = self._order
+        parts = [order[a:b] for a, b in self.spans(rect)]
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else order[:0]
+
+    def query_point(self, x: float, y: float, radius: float = 0.0) -> np.ndarray:
+        """Rows whose rect may contain a point within `radius` of (x, y)."""
+        return self.query_rect((x - radius, y - radius, radius * 2, radius * 2))
@@ -0,0 +1,97 @@
+# world/streaming.py
+import numpy as np
+
+from core import settings as S
+
+class RegionStreamer:
+    """Puts enemies in far-away regions to sleep and wakes them as the player nears.
+
+    The world is split into square REGION_SIZE regions. Regions within
+    REGION_WAKE_RADIUS (Chebyshev distance, in regions) of the player's region
+    are awake and fully simulated; awake enemies further than
+    REGION_SLEEP_RADIUS are frozen by the swarm (the gap between the two radii
+    keeps enemies on a border from flapping). Sleeping enemies are kept per
+    region, so waking a region touches only its own enemies. Only the player
+    counts, not the camera: the camera center depends on zoom, which input
+    recordings don't hold, so a camera-driven decision would break replays.
+
+    Work happens only when the player enters another region (or after
+    `mark_dirty()`), so the per-tick cost is one region lookup; the swarm's
+    tick cost follows the awake area instead of the world's content. Keep
+    REGION_SIZE * REGION_WAKE_RADIUS above the largest enemy detect radius
+    and frozen enemies are ones that would have stood idle anyway.
+    """
+    def __init__(self, swarm, region_size=None, wake_radius=None, sleep_radius=None):
+        self.swarm = swarm
+        self.region_size = max(1, int(region_size or getattr(S, "REGION_SIZE", 1024)))
+        self.wake_radius = int(wake_radius if wake_radius is not None else getattr(S, "REGION_WAKE_RADIUS", 1))
+        sleep = sleep_radius if sleep_radius is not None else getattr(S, "REGION_SLEEP_RADIUS", self.wake_radius + 1)
+        self.sleep_radius = max(self.wake_radius, int(sleep))
+        # region -> sleeping enemies (dict as an ordered set, like SpatialGrid buckets)
+        self.sleeping: dict[tuple[int, int], dict] = {}
+        self._focus = None
+        self._dirty = True
+
+    def region_of(self, x: float, y: float) -> tuple[int, int]:
+        rs = self.region_size
+        return int(x // rs), int(y // rs)
+
+    def mark_dirty(self):
+        """Re-evaluate on the next update (after spawns or a restore)."""
+        self._dirty = True
+
+    def rebuild(self):
+        """Recreate the per-region sleeping sets from the swarm's sleeping slots."""
+        swarm = self.swarm
+        self.sleeping.clear()
+        for i in range(swarm.n_active, swarm.n):
+            x, y = swarm.pos[i]
+            self.sleeping.setdefault(self.region_of(x, y), {})[swarm.views[i]] = None
+        self._dirty = True
+
+    def clear(self):
+        self.sleeping.clear()
+        self._dirty = True
+
+    def forget(self, view, x: float, y: float):
+        """Drop a sleeping enemy at (x, y) that is being despawned."""
+        key = self.region_of(x, y)
+        region = self.sleeping.get(key)
+        if region is not None:
+            region.pop(view, None)
+            if not region:
+                del self.sleeping[key]
+
+    def update(self, x: float, y: float):
+        """Wake/sleep around the player at world (x, y)."""
+        focus = self.region_of(x, y)
+        if focus == self._focus and not self._dirty:
+            return
+        self._focus = focus
+        self._dirty = False
+        self._wake_near(focus)
+        self._sleep_far(focus)
+
+    def _wake_near(self, focus):
+        r = self.wake_radius
+        fx, fy = focus
+        near = {(fx + dx, fy + dy) for dx in range(-r, r + 1) for dy in range(-r, r + 1)}
+        # sorted so the resulting slot order is the same on every run (replays)
+        for key in sorted(near & self.sleeping.keys()):
+            self.swarm.wake(self.sleeping.pop(key))
+
+    def _sleep_far(self, focus):
+        swarm = self.swarm
+        n = swarm.n_active
+        if n == 0:
+            return
+        regions = np.floor_divide(swarm.pos[:n], self.region_size).astype(np.int64)
+        fx, fy = focus
+        dist = np.maximum(np.abs(regions[:, 0] - fx), np.abs(regions[:, 1] - fy))
+        slots = np.flatnonzero(dist > self.sleep_radius)
+        if slots.size == 0:
+            return
+        views = [swarm.views[i] for i in slots.tolist()]
+        for view, (rx, ry) in zip(views, regions[slots].tolist()):
+            self.sleeping.setdefault((rx, ry), {})[view] = None
+        swarm.sleep(slots)
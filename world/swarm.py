@@ -0,0 +1,381 @@
+# world/swarm.py
+import numpy as np
+import pygame
+
+from core import settings as S
+from world.enemy import Enemy
+
+class EnemySwarm:
+    """Structure-of-arrays storage and batched AI for every enemy in a level.
+
+    Live enemies occupy slots [0, n) of flat NumPy arrays; despawning swaps the
+    last slot into the hole so the live range stays dense. `update` runs chase,
+    range checks and attack cooldowns for the whole swarm as array operations,
+    and marks the optional SpatialGrid stale; it is rebuilt in one pass from
+    `pos` by the first query after enemies moved. `views` holds one Enemy per
+    live slot, in slot order.
+
+    The live range is split further: slots [0, n_active) are simulated, slots
+    [n_active, n) are asleep (frozen in place, still in the grid, still drawn).
+    `sleep` / `wake` move enemies across the boundary; a RegionStreamer
+    (world/streaming.py) decides which.
+
+    Thinking (re-aiming at the player, the chase decision) is time-sliced by
+    distance band: near enemies think every tick, mid-range every
+    AI_MID_INTERVAL ticks, far ones every AI_FAR_INTERVAL, with at most
+    AI_THINK_BUDGET mid/far thinks per tick (most overdue first). Between
+    thinks every awake enemy keeps moving along its `vel`, and only the near
+    band is checked for attacks.
+    """
+    # every per-enemy array: moved together on despawn/sleep/wake, and the swarm's
+    # state (snapshots save [0, n) of each)
+    STATE_FIELDS = ("pos", "prev", "hp", "atk_cd", "arch", "vel", "next_think", "band")
+
+    # AI distance bands (index into the band arrays)
+    NEAR, MID, FAR = 0, 1, 2
+
+    def __init__(self, player, grid=None, capacity=None, archetypes=None):
+        self.player = player
+        self.grid = grid
+        self._grid_views: list[Enemy] = []  # views by the slot they had when the grid was built
+        self._grid_sorted = None            # the same views in grid order, made on first use
+        self._grid_stale = True
+        self._grid_slots = False  # True while grid rows are still slots (nothing despawned or swapped since)
+
+        # per-archetype stats, indexed by archetype id
+        self.archetypes = dict(archetypes or S.ENEMY_ARCHETYPES)
+        self.arch_ids = {name: i for i, name in enumerate(self.archetypes)}
+        stats = list(self.archetypes.values())
+        self.arch_speed    = np.array([a["speed"] for a in stats], dtype=np.float64)
+        self.arch_detect   = np.array([a["detect_radius"] for a in stats], dtype=np.float64)
+        self.arch_range    = np.array([a["attack_range"] for a in stats], dtype=np.float64)
+        self.arch_cooldown = np.array([a["attack_cooldown"] for a in stats], dtype=np.float64)
+        self.arch_damage   = np.array([a["attack_damage"] for a in stats], dtype=np.int32)
+        self.arch_size     = np.array([a["size"] for a in stats], dtype=np.int32)
+        self.arch_images: list[pygame.Surface] = [self._make_image(name) for name in self.archetypes]
+
+        # per-enemy state
+        cap = max(1, int(capacity or getattr(S, "ENEMY_SWARM_CAPACITY", 256)))
+        self.n = 0
+        self.n_active = 0
+        self.pos    = np.zeros((cap, 2), dtype=np.float64)
+        self.prev   = np.zeros((cap, 2), dtype=np.float64)  # position at the start of the last tick
+        self.hp     = np.zeros(cap, dtype=np.int32)
+        self.atk_cd = np.zeros(cap, dtype=np.float64)
+        self.arch   = np.zeros(cap, dtype=np.int16)
+        self.vel    = np.zeros((cap, 2), dtype=np.float64)  # px/s, set when the enemy thinks
+        self.next_think = np.zeros(cap, dtype=np.int64)      # tick of the next think
+        self.band   = np.zeros(cap, dtype=np.int8)           # distance band at the last think
+        self.views: list[Enemy] = []
+
+        # AI level of detail
+        self.tick = 0
+        self._spawned = 0  # spawn counter, staggers first thinks
+        self.band_radius = np.array([getattr(S, "AI_NEAR_RADIUS", 256), getattr(S, "AI_MID_RADIUS", 960)],
+                                    dtype=np.float64)
+        self.band_interval = np.array([1, getattr(S, "AI_MID_INTERVAL", 4), getattr(S, "AI_FAR_INTERVAL", 30)],
+                                      dtype=np.int64)
+        self.think_budget = int(getattr(S, "AI_THINK_BUDGET", 4096))
+        self.flow = None   # optional FlowField (world/flowfield.py) steering chasers around blocked tiles
+        self.streamer = None  # optional RegionStreamer (world/streaming.py) holding the sleeping enemies
+        self.thinks = 0  # enemies that thought on the last tick
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def capacity(self) -> int:
+        return self.pos.shape[0]
+
+    def _grow(self, need: int):
+        cap = self.capacity
+        if need <= cap:
+            return
+        while cap < need:
+            cap *= 2
+        for name in self.STATE_FIELDS:
+            old = getattr(self, name)
+            new = np.zeros((cap,) + old.shape[1:], dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def _make_image(self, arch_name: str) -> pygame.Surface:
+        a = self.archetypes[arch_name]
+        size = int(a["size"])
+        # simple colored box, shared by every enemy of the archetype
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
+        image.fill(a.get("color", (200, 60, 60)))
+        pygame.draw.rect(image, (0, 0, 0), image.get_rect(), 2)
+        return image
+
+    # ---------- Lifetime ----------
+    def spawn(self, x: float, y: float, archetype: str = "grunt", hp: int | None = None) -> Enemy:
+        a = self.arch_ids[archetype]
+        i = self.n
+        self._grow(i + 1)
+        self.pos[i] = (x, y)
+        self.prev[i] = (x, y)
+        self.hp[i] = int(hp if hp is not None else self.archetypes[archetype].get("hp", 100))
+        self.atk_cd[i] = 0.0
+        self.arch[i] = a
+        self.vel[i] = (0.0, 0.0)
+        self.band[i] = self.FAR
+        # first thinks spread over a far interval so a big spawn doesn't think all at once
+        self.next_think[i] = self.tick + self._spawned % self.band_interval[self.FAR]
+        self._spawned += 1
+        self.n = i + 1
+
+        view = Enemy(self, i, self.arch_images[a])
+        self.views.append(view)
+        self._grid_stale = True
+        # new enemies start awake
+        self._swap(i, self.n_active)
+        self.n_active += 1
+        return view
+
+    def despawn(self, view: Enemy):
+        i = view.index
+        if i is None:
+            return
+        if i >= self.n_active and self.streamer is not None:
+            self.streamer.forget(view, self.pos[i, 0], self.pos[i, 1])
+        # the grid keeps its rows: queries skip detached views and read moved ones' new slot
+        view._detach()
+        self._grid_slots = False
+
+        if i < self.n_active:
+            # hand the hole to the sleeping range first, so both ranges stay dense
+            self.n_active -= 1
+            self._move(self.n_active, i)
+            i = self.n_active
+        last = self.n - 1
+        if i != last:
+            # move the last slot into the hole to keep [0, n) dense
+            self._move(last, i)
+        self.views.pop()
+        self.n = last
+
+    def _move(self, src: int, dst: int):
+        """Copy slot `src` over slot `dst` (whose enemy is going away)."""
+        for name in self.STATE_FIELDS:
+            arr = getattr(self, name)
+            arr[dst] = arr[src]
+        moved = self.views[src]
+        moved.index = dst
+        self.views[dst] = moved
+
+    def _swap(self, i: int, j: int):
+        if i == j:
+            return
+        self._grid_slots = False
+        for name in self.STATE_FIELDS:
+            arr = getattr(self, name)
+            arr[[i, j]] = arr[[j, i]]
+        views = self.views
+        views[i], views[j] = views[j], views[i]
+        views[i].index = i
+        views[j].index = j
+
+    def clear(self):
+        for view in self.views:
+            view._detach()
+        self.views.clear()
+        self._grid_stale = True
+        self.n = 0
+        self.n_active = 0
+        self.tick = 0
+        self._spawned = 0
+
+    # ---------- Sleep / wake ----------
+    def sleep(self, slots):
+        """Freeze the given awake slots (moves them past n_active)."""
+        # highest first so a swap never moves a slot still to be put to sleep
+        for i in sorted((int(i) for i in slots), reverse=True):
+            if i >= self.n_active:
+                continue
+            self.n_active -= 1
+            self._swap(i, self.n_active)
+            last = self.n_active
+            self.prev[last] = self.pos[last]  # no interpolation while frozen
+
+    def wake(self, views):
+        """Resume simulating the given sleeping enemies."""
+        for view in views:
+            i = view.index
+            if i is None or i < self.n_active:
+                continue
+            self._swap(i, self.n_active)
+            self.next_think[self.n_active] = self.tick  # re-aim on the next tick
+            self.n_active += 1
+
+    def load_state(self, n: int, arrays: dict, n_active: int | None = None):
+        """Overwrite slots [0, n) from `arrays` (STATE_FIELDS) in place; the first `n_active` are awake.
+
+        Existing views are reused for the first slots, surplus ones detached and
+        missing ones created; the grid is rebuilt on the next query.
+        """
+        self._grow(n)
+        for name in self.STATE_FIELDS:
+            getattr(self, name)[:n] = arrays[name]
+
+        views = self.views
+        while len(views) > n:
+            view = views.pop()
+            view.index = len(views)  # so _detach reads a valid slot
+            view._detach()
+        for i in range(len(views), n):
+            views.append(Enemy(self, i, None))
+        self.n = n
+        self.n_active = n if n_active is None else min(int(n_active), n)
+        for i, view in enumerate(views):
+            view.index = i
+            view.image = self.arch_images[self.arch[i]]
+        self._grid_stale = True
+
+    # ---------- Simulation ----------
+    def _due(self, n: int) -> np.ndarray:
+        """Sorted slots that think this tick: every due near enemy, then mid/far up to the budget."""
+        due = np.flatnonzero(self.next_think[:n] <= self.tick)
+        if due.size <= self.think_budget:
+            return due
+        near = due[self.band[due] == self.NEAR]
+        rest = due[self.band[due] != self.NEAR]
+        room = max(0, self.think_budget - near.size)
+        if rest.size > room:
+            # most overdue first; the rest stay due and go next tick
+            rest = rest[np.argsort(self.next_think[rest], kind="stable")[:room]]
+        return np.sort(np.concatenate((near, rest)))
+
+    def _think(self, idx: np.ndarray, player_xy) -> np.ndarray:
+        """Re-aim `idx` at the player, re-band them and schedule their next think; returns their distances."""
+        pos = self.pos[idx]
+        arch = self.arch[idx]
+        to_p = player_xy - pos
+        dist2 = np.einsum("ij,ij->i", to_p, to_p)
+        dist = np.sqrt(dist2)
+        # chase player if within detection radius
+        detect = self.arch_detect[arch]
+        chase = (dist2 > 1e-6) & (dist2 <= detect * detect)
+        scale = np.where(chase, self.arch_speed[arch] / np.maximum(dist, 1e-9), 0.0)
+        vel = to_p * scale[:, None]
+        flow = self.flow
+        if flow is not None and flow.active:
+            # follow the shared path field where it has a direction, else head straight in
+            dirs, ok = flow.lookup(pos)
+            ok &= chase
+            vel[ok] = dirs[ok] * self.arch_speed[arch[ok], None]
+        self.vel[idx] = vel
+
+        band = np.searchsorted(self.band_radius, dist).astype(np.int8)
+        self.band[idx] = band
+        self.next_think[idx] = self.tick + self.band_interval[band]
+        return dist
+
+    def update(self, dt: float):
+        n = self.n_active  # sleeping enemies are not simulated
+        self.thinks = 0
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        cd = self.atk_cd[:n]
+        self.prev[:n] = pos
+
+        # cooldown tick
+        np.subtract(cd, dt, out=cd)
+        np.maximum(cd, 0.0, out=cd)
+
+        # time-sliced thinking, then everyone moves along their current velocity
+        player = self.player
+        thinking = self._due(n)
+        dist = self._think(thinking, np.array((player.pos.x, player.pos.y)))
+        self.thinks = int(thinking.size)
+        self.tick += 1
+        pos += self.vel[:n] * dt
+        if self.flow is not None:
+            self.flow.resolve(self.prev[:n], pos)  # blocked tiles stop movement, not just steer it
+        self._grid_stale = True
+
+        # ---- DAMAGE PHASE (respect God Mode) ----
+        if player.dead or getattr(player, "god_mode", False):
+            return
+
+        # only the near band can reach the player before its next think
+        near = self.band[thinking] == self.NEAR
+        idx = thinking[near]
+        if idx.size == 0:
+            return
+        arch = self.arch[idx]
+        # enemy rects are centered on the rounded position, like Rect(center=...)
+        size = self.arch_size[arch]
+        left = np.rint(self.pos[idx, 0]) - size // 2
+        top = np.rint(self.pos[idx, 1]) - size // 2
+        pr = player.rect
+        colliding = (left < pr.right) & (left + size > pr.left) & (top < pr.bottom) & (top + size > pr.top)
+        close = (dist[near] <= self.arch_range[arch]) | colliding
+        ready = close & (self.atk_cd[idx] <= 0.0)
+        hits = idx[ready]
+        if hits.size:
+            self.atk_cd[hits] = self.arch_cooldown[self.arch[hits]]
+            # Only ever damage through the Player API
+            for i in hits:
+                player.take_damage(int(self.arch_damage[self.arch[i]]))
+
+    def interpolated(self, alpha: float, idx=None):
+        """Render positions blended from the last tick by `alpha`, for slots [0, n) or just `idx`."""
+        if idx is None:
+            pos, prev = self.pos[:self.n], self.prev[:self.n]
+        else:
+            pos, prev = self.pos[idx], self.prev[idx]
+        if alpha >= 1.0:
+            return pos
+        return prev + (pos - prev) * alpha
+
+    # ---------- Queries ----------
+    def _grid_index(self):
+        """The grid, rebuilt from `pos` if enemies moved or spawned since the last query."""
+        grid = self.grid
+        if self._grid_stale:
+            grid.build(self.pos[:self.n])
+            self._grid_views = list(self.views)
+            self._grid_sorted = None
+            self._grid_stale = False
+            self._grid_slots = True
+        return grid
+
+    def query_rect(self, rect) -> list[Enemy]:
+        """Live enemies the grid reports as possibly overlapping `rect`, grouped by cell."""
+        if self.grid is None:
+            return list(self.views)
+        grid = self._grid_index()
+        views = self._grid_sorted
+        if views is None:
+            built = self._grid_views
+            views = self._grid_sorted = [built[i] for i in grid.order.tolist()]
+        out = []
+        for a, b in grid.spans(rect):
+            out += views[a:b]
+        if self._grid_slots:
+            return out
+        # rows are slots as of the build: dead views are detached since, moved ones know their new slot
+        return [v for v in out if v.index is not None]
+
+    def indices_in(self, rect) -> np.ndarray:
+        """Sorted slots of enemies the grid reports as possibly overlapping `rect`."""
+        if self.grid is None:
+            return np.arange(self.n)
+        grid = self._grid_index()
+        if self._grid_slots:
+            return np.sort(grid.query_rect(rect))
+        views = self.query_rect(rect)
+        idx = np.fromiter((v.index for v in views), dtype=np.int64, count=len(views))
+        idx.sort()  # slot order, so overlapping sprites stack the same as a full draw
+        return idx
+
+    def at_point(self, x: float, y: float) -> Enemy | None:
+        """Lowest-slot enemy whose rect contains the point, or None."""
+        point = (int(x), int(y))
+        for i in self.indices_in((x, y, 0, 0)).tolist():
+            view = self.views[i]
+            if view.rect.collidepoint(point):
+                return view
+        return None
@@ -1,14 +1,22 @@
 # world/test_level.py
-import math
 from pathlib import Path
+import math
 import random
+import numpy as np
 import pygame
 
 from core import settings as S
-from world.player import Player
+from world.player import Player, SHEET_PATH as PLAYER_SHEET
 from world.camera import Camera
 from world.enemy import Enemy
-from world.projectile import Projectile
+from world.projectile import ProjectilePool
+from world.background import ChunkedBackground
+from world.spatial import SpatialGrid
+from world.swarm import EnemySwarm
+from world.streaming import RegionStreamer
+from world.flowfield import FlowField
+from world.render_batch import SpriteAtlas, RenderBatch
+from world import snapshot
 
 def _slice_tile(tileset: pygame.Surface, tile_size: int, col: int, row: int) -> pygame.Surface:
     x = col * tile_size; y = row * tile_size
@@ -17,10 +25,11 @@ def _slice_tile(tileset: pygame.Surface, tile_size: int, col: int, row: int) ->
     tile.blit(tileset, (0, 0), rect)
     return tile
 
-def _load_ground_tile() -> pygame.Surface:
+def _load_ground_tile(assets) -> pygame.Surface:
     path = Path(S.TILESET_PATH)
     try:
-        tileset = pygame.image.load(str(path)).convert()
+        # usually decoded already by the background loader
+        tileset = assets.sheet(path).convert()
     except Exception:
         t = pygame.Surface((S.TILE_SIZE, S.TILE_SIZE)).convert()
         t.fill((78, 161, 72)); pygame.draw.rect(t, (72, 149, 66), t.get_rect(), 3)
@@ -38,25 +47,37 @@ def _load_ground_tile() -> pygame.Surface:
     t.fill((78, 161, 72)); pygame.draw.rect(t, (72, 149, 66), t.get_rect(), 3)
     return t
 
-def _build_tiled_surface(tile: pygame.Surface, width: int, height: int) -> pygame.Surface:
-    cols = math.ceil(width / tile.get_width())
-    rows = math.ceil(height / tile.get_height())
-    surf = pygame.Surface((width, height)).convert()
-    for r in range(rows):
-        for c in range(cols):
-            surf.blit(tile, (c * tile.get_width(), r * tile.get_height()))
-    return surf
-
 class TestLevel:
-    # --- add this new method anywhere in TestLevel class ---
+    # sheets the level needs; Game queues these on the background loader
+    SHEETS = (PLAYER_SHEET, S.TILESET_PATH)
+
     def reset_world(self):
-        """Hard reset: restore player, clear projectiles/target, and respawn enemies."""
+        """Hard reset: back to the level's starting state.
+
+        Restores the snapshot taken when the level was built, so nothing is
+        re-created. If the enemy count or seed changed since, enemies are
+        respawned instead and that becomes the new starting snapshot.
+        """
+        key = (self.enemy_count, self.seed)
+        if self._initial is not None and self._initial[0] == key:
+            self.restore(self._initial[1])
+        else:
+            self._respawn()
+            self._initial = (key, self.snapshot())
+
+        # an input recording restarts with the level
+        if self.recorder is not None:
+            self.recorder.restart()
+
+    def _respawn(self):
+        """Rebuild the starting state from scratch: player at spawn, fresh enemies, no projectiles."""
         # Player
         self.player.dead = False
         self.player.hp = self.player.max_hp
         self.player.invuln_t = 0.0
         self.player.pos.update(self.spawn_pos)
         self.player.rect.center = (round(self.spawn_pos[0]), round(self.spawn_pos[1]))
+        self._player_prev = self.spawn_pos
 
         # Projectiles & target
         self.projectiles.clear()
@@ -65,52 +86,90 @@ class TestLevel:
 
         # Enemies
         self.enemy_sprites.empty()
-        self.enemies.clear()
-        self._spawn_enemies(n=20, margin=128)
+        self.swarm.clear()
+        self.streamer.clear()
+        self.flow.reset()
+        self._spawn_enemies(n=self.enemy_count, margin=128)
+
+    # ========= Snapshots (world/snapshot.py) =========
+    def snapshot(self) -> bytes:
+        return snapshot.take(self)
 
-        # Camera will naturally lerp back to the player; if you want a hard snap,
-        # and your Camera has such a method, you could call:
-        #   self.camera.set_target(self.player)
-        #   self.camera.update(0)  # or self.camera.snap_to_target() if you add one
+    def restore(self, data: bytes):
+        snapshot.restore(self, data)
 
     def __init__(self, game):
         self.game = game
 
-        # --- world surface (bigger than viewport)
+        # --- world background (bigger than viewport), baked lazily per chunk
         self.world_size = (S.WORLD_W, S.WORLD_H)
-        ground = _load_ground_tile()
-        self.world_bg = _build_tiled_surface(ground, *self.world_size)
+        self._world_rect = pygame.Rect(0, 0, *self.world_size)
+        ground = _load_ground_tile(game.assets)
+        self.background = ChunkedBackground(lambda col, row: ground, self.world_size)
 
         # --- player
         self.spawn_pos = (self.world_size[0] // 2, self.world_size[1] // 2)
-        self.player = Player(pos=self.spawn_pos)
+        self.player = Player(pos=self.spawn_pos, assets=game.assets)
+        self._player_prev = self.spawn_pos  # player center at the start of the last tick
 
         # --- enemies
+        self.enemy_grid = SpatialGrid()  # "who is near X" queries, through the swarm
+        self.swarm = EnemySwarm(self.player, grid=self.enemy_grid)
         self.enemy_sprites = pygame.sprite.Group()
-        self.enemies = []  # for radar dots
-        self._spawn_enemies(n=20, margin=128)
+        self.enemies = self.swarm.views  # live Enemy views (radar dots), kept by the swarm
+        self.streamer = RegionStreamer(self.swarm)  # far regions sleep, near ones are simulated
+        self.swarm.streamer = self.streamer
+        # chasers path around blocked tiles via one shared field (inactive while nothing is blocked)
+        self.flow = FlowField(self.world_size, S.TILE_SIZE)
+        for col, row in getattr(S, "FLOW_BLOCKED_TILES", ()):
+            self.flow.set_blocked(col, row)
+        self.swarm.flow = self.flow
+        self.enemy_count = getattr(S, "LEVEL_ENEMY_COUNT", 20)
+        self.seed = getattr(S, "WORLD_SEED", 1337)
+        self._spawn_enemies(n=self.enemy_count, margin=128)
 
         # --- projectiles
-        self.projectiles = []
+        self.projectiles = ProjectilePool()
         self.cast_cooldown = 0.10
         self.cast_timer = 0.0
 
         # --- targeting
         self.current_target: Enemy | None = None
 
+        # --- input recording (core/replay.py InputRecorder), None when not recording
+        self.recorder = None
+
         # --- camera
         self.camera = Camera(S.WORLD_RECT, self.world_size, zoom=S.CAMERA_ZOOM, lerp=S.CAMERA_LERP)
         self.camera.set_target(self.player)
 
+        # --- player frames pre-scaled for the current zoom (dropped when it changes)
+        self._frames_zoom = None
+        self._zoomed_frames: dict[pygame.Surface, pygame.Surface] = {}
+        self._ghost_frames: dict[pygame.Surface, pygame.Surface] = {}
+
+        # batched sprite drawing: enemies, projectiles and effects share one atlas
+        self.sprite_atlas = SpriteAtlas()
+        self.batch = RenderBatch(self.sprite_atlas)
+        self._enemy_areas = [self.sprite_atlas.add(("enemy", k), img)
+                             for k, img in enumerate(self.swarm.arch_images)]
+        self._enemy_half = self.swarm.arch_size // 2
+
+        # view culling: only what overlaps the camera (+ margin) is queued
+        self.cull_margin = getattr(S, "CULL_MARGIN", 16)
+
+        # starting state, restored by reset_world: ((enemy_count, seed), snapshot)
+        self._initial = ((self.enemy_count, self.seed), self.snapshot())
+
     def _spawn_enemies(self, n=15, margin=128):
-        rnd = random.Random(1337)
+        rnd = random.Random(self.seed)
         W, H = self.world_size
         for _ in range(n):
             x = rnd.randint(margin, W - margin)
             y = rnd.randint(margin, H - margin)
-            e = Enemy(x, y, player=self.player)
-            self.enemies.append(e)
+            e = self.swarm.spawn(x, y)
             self.enemy_sprites.add(e)
+        self.streamer.mark_dirty()
 
     # ========= Input from Game =========
     def handle_event(self, event):
@@ -128,7 +187,14 @@ class TestLevel:
         world_xy = self.screen_to_world(screen_pos)
         if world_xy is None:
             return
-        wx, wy = world_xy
+        self.click_world(*world_xy, selected_spell)
+
+    def click_world(self, wx: float, wy: float, selected_spell):
+        """World-space half of handle_world_click (also what replays feed back)."""
+        if self.recorder is not None:
+            self.recorder.click(wx, wy, selected_spell)
+        if not selected_spell or self.player.dead:
+            return
 
         # click-to-target
         clicked_enemy = self._enemy_at_world_point(wx, wy)
@@ -138,43 +204,53 @@ class TestLevel:
         # cast only if cursor is on the current target
         if self.current_target and self.current_target.rect.collidepoint((int(wx), int(wy))):
             if self.cast_timer <= 0.0 and selected_spell == "spark":
-                start = self.player.rect.center
-                self.projectiles.append(
-                    Projectile(start_xy=start, target_xy=self.current_target.rect.center,
-                               speed=800, radius=4, damage=28,
-                               color=(170, 120, 255), max_dist=1400)
-                )
+                self.cast_spark(self.current_target.rect.center)
                 self.cast_timer = self.cast_cooldown
                 self.game.log("Cast Spark")
 
+    def cast_spark(self, target_xy):
+        """Fire a Spark from the player toward `target_xy` (no cooldown check)."""
+        self.projectiles.spawn(start_xy=self.player.rect.center, target_xy=target_xy,
+                               speed=800, radius=4, damage=28,
+                               color=(170, 120, 255), max_dist=1400)
+        self.game.audio.play_sfx("spark")
+
     # ========= Helpers =========
     def _enemy_at_world_point(self, wx: float, wy: float) -> Enemy | None:
-        point = (int(wx), int(wy))
-        for e in self.enemy_sprites:
-            if e.rect.collidepoint(point):
-                return e
-        return None
+        return self.swarm.at_point(wx, wy)
+
+    def _remove_enemy(self, enemy: Enemy):
+        enemy.kill()  # leaves enemy_sprites, the swarm and the grid
+        if self.current_target is enemy:
+            self.current_target = None
 
     def screen_to_world(self, screen_xy):
         sx, sy = screen_xy
         vx, vy, vw, vh = self.camera.viewport
         if not (vx <= sx < vx + vw and vy <= sy < vy + vh):
             return None
+        # inverse of the mapping in draw(): screen = viewport + round(world * zoom) - round(cam * zoom)
         cam = self.camera.view_rect()
-        fx = (sx - vx) / vw
-        fy = (sy - vy) / vh
-        wx = cam.left + fx * cam.width
-        wy = cam.top  + fy * cam.height
+        z = self.camera.zoom
+        wx = (sx - vx + round(cam.left * z)) / z
+        wy = (sy - vy + round(cam.top * z)) / z
         return (wx, wy)
 
     # ========= Update / Draw =========
     def update(self, dt):
+        prof = self.game.profiler
+        self.game.audio.begin_tick()  # sound coalescing is per tick, whichever loop drives it
+
         # cooldowns
         if self.cast_timer > 0:
             self.cast_timer = max(0.0, self.cast_timer - dt)
 
         # player
+        t = prof.start()
+        self._player_prev = (self.player.pos.x, self.player.pos.y)
         self.player.update(dt)
+        if self.recorder is not None:
+            self.recorder.tick(self.player.input_bits)
 
         # clamp player center to world bounds
         half_w = self.player.rect.width  * 0.5
@@ -184,67 +260,131 @@ class TestLevel:
         py = max(half_h, min(H - half_h, self.player.pos.y))
         self.player.pos.update((px, py))
         self.player.rect.center = (round(px), round(py))
-
-        # enemies (chase + damage)
-        self.enemy_sprites.update(dt)
-
-        # projectiles (hits)
-        for p in list(self.projectiles):
-            p.update(dt)
-            hit_any = False
-            for enemy in list(self.enemy_sprites):
-                if p.rect.colliderect(enemy.rect):
-                    enemy.hp -= p.damage
-                    hit_any = True
-                    if enemy.hp <= 0:
-                        self.enemy_sprites.remove(enemy)
-                        if enemy in self.enemies: self.enemies.remove(enemy)
-                        if self.current_target is enemy:
-                            self.current_target = None
-                    break
-            if hit_any or not p.alive():
-                self.projectiles.remove(p)
+        prof.stop("tick.player", t)
+
+        # enemies (chase + damage, batched)
+        t = prof.start()
+        self.streamer.update(self.player.pos.x, self.player.pos.y)
+        self.flow.update(self.player.pos.x, self.player.pos.y)
+        self.swarm.update(dt)
+        prof.stop("tick.enemies", t)
+
+        # projectiles (batched move, swept hits, range expiry)
+        t = prof.start()
+        self.projectiles.update(dt)
+        spent = []
+        for slot, enemy in self.projectiles.hits(self.swarm):
+            spent.append(slot)
+            enemy.hp -= int(self.projectiles.damage[slot])
+            if enemy.hp <= 0:
+                self._remove_enemy(enemy)
+                self.game.audio.play_sfx("enemy_die")
+            else:
+                self.game.audio.play_sfx("enemy_hit")
+        self.projectiles.retire(spent)
+        prof.stop("tick.projectiles", t)
 
         # clear target that died elsewhere
         if self.current_target and (self.current_target not in self.enemy_sprites):
             self.current_target = None
 
         # camera last
+        t = prof.start()
         self.camera.update(dt)
-
-    def draw(self, screen):
-        cam_rect = self.camera.view_rect()
-
-        # camera layer (world chunk)
-        layer = pygame.Surface(cam_rect.size, pygame.SRCALPHA)
-        layer.blit(self.world_bg, (-cam_rect.x, -cam_rect.y))
-
-        # enemies
-        for e in self.enemy_sprites:
-            layer.blit(e.image, (e.rect.x - cam_rect.x, e.rect.y - cam_rect.y))
+        prof.stop("tick.camera", t)
+
+    def _zoomed(self, image: pygame.Surface, zoom: float) -> pygame.Surface:
+        """`image` scaled for `zoom`, built once per frame image while the zoom holds."""
+        if zoom == 1.0:
+            return image
+        if zoom != self._frames_zoom:
+            self._frames_zoom = zoom
+            self._zoomed_frames.clear()
+            self._ghost_frames.clear()
+        scaled = self._zoomed_frames.get(image)
+        if scaled is None:
+            w, h = image.get_size()
+            scaled = pygame.transform.scale(image, (round(w * zoom), round(h * zoom)))
+            self._zoomed_frames[image] = scaled
+        return scaled
+
+    def _ghost_frame(self, image: pygame.Surface) -> pygame.Surface:
+        """Translucent copy of a player frame for the invulnerability tint (built once per animation frame)."""
+        ghost = self._ghost_frames.get(image)
+        if ghost is None:
+            ghost = image.copy()
+            ghost.set_alpha(180)  # 0..255
+            self._ghost_frames[image] = ghost
+        return ghost
+
+    def _highlight_key(self, size) -> tuple:
+        """Atlas key of the target outline for a sprite of `size`, rendered on first use."""
+        key = ("highlight", tuple(size))
+        if key not in self.sprite_atlas:
+            outline = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(outline, (255, 240, 120), outline.get_rect(), 2)
+            self.sprite_atlas.add(key, outline)
+        return key
+
+    def draw(self, screen, alpha: float = 1.0):
+        """Render the world; `alpha` in [0, 1] blends positions between the last two ticks."""
+        prof = self.game.profiler
+        camera = self.camera
+        zoom = camera.zoom
+        cam_rect = camera.view_rect(alpha)
+        viewport = camera.viewport
+        # composed straight at screen resolution: world p -> origin + round(p * zoom)
+        origin = (viewport.x - round(cam_rect.x * zoom), viewport.y - round(cam_rect.y * zoom))
+        view = pygame.Rect(cam_rect.x, cam_rect.y, math.ceil(viewport.w / zoom), math.ceil(viewport.h / zoom))
+        clip = screen.get_clip()
+        screen.set_clip(viewport)
+
+        # ground: chunks pre-scaled for the current zoom
+        t = prof.start()
+        if not self._world_rect.contains(view):
+            screen.fill(S.BLACK, viewport)  # view pokes past the world edge
+        self.background.draw(screen, view, zoom, origin)
+        prof.stop("world.ground", t)
+
+        # sprites: queued in draw order, then submitted as one blits() call
+        t = prof.start()
+        batch = self.batch
+        batch.begin(zoom, origin)
+
+        # enemies: grid query around the view, then interpolated centers for those slots
+        swarm = self.swarm
+        margin = self.cull_margin
+        idx = swarm.indices_in(cam_rect.inflate(2 * margin, 2 * margin))
+        epos = swarm.interpolated(alpha, idx)
+        arch = swarm.arch[idx]
+        topleft = np.rint(epos) - self._enemy_half[arch][:, None]
+        areas = [batch.area(("enemy", k)) for k in range(len(self._enemy_areas))]
+        batch.add_many([areas[a] for a in arch.tolist()], batch.to_screen(topleft))
 
         # target highlight
-        if self.current_target:
-            r = self.current_target.rect.copy()
-            r.x -= cam_rect.x; r.y -= cam_rect.y
-            pygame.draw.rect(layer, (255, 240, 120), r, 2)
+        target = self.current_target
+        if target is not None and target.index is not None:
+            tx, ty = swarm.interpolated(alpha, target.index)
+            r = target.rect
+            r.center = (round(tx), round(ty))
+            if r.colliderect(view):
+                batch.add(self._highlight_key(r.size), *batch.point(r.x, r.y))
 
         # projectiles
-        for p in self.projectiles:
-            p.draw_on_layer(layer, cam_rect)
+        shots = self.projectiles.submit(batch, view, alpha, margin)
 
-        # player (ALWAYS draw; tint while invulnerable)
-        px = self.player.rect.x - cam_rect.x
-        py = self.player.rect.y - cam_rect.y
-        if self.player.invuln_t > 0.0:
-            img = self.player.image.copy()
-            img.set_alpha(180)  # 0..255
-            layer.blit(img, (px, py))
-
-        else:
-            layer.blit(self.player.image, (px, py))
+        if prof.enabled:
+            prof.count("enemies_drawn", f"{len(idx)}/{swarm.n}")
+            prof.count("enemies_awake", f"{swarm.n_active}/{swarm.n}")
+            prof.count("projectiles_drawn", f"{shots}/{len(self.projectiles)}")
 
-        # scale to viewport and blit
-        view_w, view_h = self.camera.viewport.size
-        scaled = pygame.transform.scale(layer, (view_w, view_h))
-        screen.blit(scaled, self.camera.viewport.topleft)
+        # player (ALWAYS draw; tint while invulnerable)
+        (x0, y0), pos = self._player_prev, self.player.pos
+        img = self.player.image
+        px = round(x0 + (pos.x - x0) * alpha) - img.get_width() // 2
+        py = round(y0 + (pos.y - y0) * alpha) - img.get_height() // 2
+        img = self._zoomed(img, zoom)
+        batch.add_surface(self._ghost_frame(img) if self.player.invuln_t > 0.0 else img, *batch.point(px, py))
+        batch.flush(screen)
+        prof.stop("world.sprites", t)
+        screen.set_clip(clip)